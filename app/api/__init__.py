@@ -0,0 +1,3 @@
+"""
+HTTP job API package
+"""
@@ -0,0 +1,54 @@
+"""
+Run the HTTP job API: python -m app.api
+"""
+
+import asyncio
+
+from app.api.jobs import JobManager
+from app.api.server import ApiServer
+from app.core.bootstrap_manager import BootstrapManager
+from app.core.config import Settings, check_token
+from app.core.exceptions import ConfigError
+from app.core.initializers import default_initializers
+from app.core.interfaces.command import ICommand
+from app.core.interfaces.console import IConsole
+from app.core.interfaces.di import IDIContainer
+
+
+async def serve(container: IDIContainer) -> None:
+    settings = container.get(Settings)
+    try:
+        token = check_token(settings.api_token, "API_TOKEN")
+    except ConfigError as e:
+        raise SystemExit(f"Cannot start the API: {e}")
+    server = ApiServer(JobManager(container.get(ICommand)),
+                       token=token,
+                       host=settings.api_host,
+                       port=settings.api_port,
+                       prefix=f"{settings.api_prefix}/{settings.api_version}")
+    server.set_console(container.get(IConsole))
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    bootstrap = BootstrapManager()
+    for initializer in default_initializers():
+        bootstrap.add(initializer)
+
+    report = bootstrap.start()
+    console = bootstrap.container.get(IConsole)
+    bootstrap.set_console(console)
+    console.debug(f"Startup timing:\n{report.format()}", "bootstrap")
+    try:
+        asyncio.run(serve(bootstrap.container))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        bootstrap.shutdown()
+
+
+if __name__ == "__main__":
+    main()
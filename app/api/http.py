@@ -0,0 +1,166 @@
+"""
+Minimal HTTP/1.1 protocol helpers on asyncio streams
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from app.core.exceptions import HttpError
+
+MAX_BODY_SIZE = 1024 * 1024
+
+
+@dataclass
+class Request:
+    """
+    Parsed HTTP request
+    """
+    method: str
+    path: str
+    version: str
+    headers: Dict[str, str]
+    query: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    @property
+    def keep_alive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self) -> Any:
+        if not self.body:
+            return {}
+        try:
+            return json.loads(self.body)
+        except ValueError as e:
+            raise HttpError(400, f"Invalid JSON body: {e}")
+
+
+async def read_request(reader: asyncio.StreamReader,
+                       max_body_size: int = MAX_BODY_SIZE
+                       ) -> Optional[Request]:
+    """
+    Read one request from the stream
+
+    Args:
+        reader: stream of the client connection
+        max_body_size: maximum accepted Content-Length
+
+    Returns:
+        Request or None if the client closed the connection
+
+    Raises:
+        HttpError: if the request is malformed
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise HttpError(400, "Incomplete request")
+    except asyncio.LimitOverrunError:
+        raise HttpError(431, "Request header too large")
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        raise HttpError(411, "Chunked request body is not supported")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(400, "Invalid Content-Length")
+    if length > max_body_size:
+        raise HttpError(413, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+
+    url = urlsplit(target)
+    return Request(method=method.upper(),
+                   path=unquote(url.path),
+                   version=version,
+                   headers=headers,
+                   query=dict(parse_qsl(url.query)),
+                   body=body)
+
+
+def _status_line(status: int) -> str:
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    return f"HTTP/1.1 {status} {reason}\r\n"
+
+
+def build_response(status: int,
+                   body: bytes = b"",
+                   content_type: str = "application/json",
+                   keep_alive: bool = True,
+                   headers: Optional[Dict[str, str]] = None) -> bytes:
+    """
+    Build a complete response with Content-Length
+    """
+    extra = "".join(f"{name}: {value}\r\n"
+                    for name, value in (headers or {}).items())
+    head = (f"{_status_line(status)}"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"{extra}"
+            f"\r\n")
+    return head.encode("latin-1") + body
+
+
+def json_response(status: int,
+                  data: Any,
+                  keep_alive: bool = True,
+                  headers: Optional[Dict[str, str]] = None) -> bytes:
+    return build_response(status, json.dumps(data).encode(),
+                          keep_alive=keep_alive, headers=headers)
+
+
+class ChunkedWriter:
+    """
+    Writer of a response with chunked transfer encoding
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter):
+        self.writer = writer
+
+    async def start(self,
+                    status: int = 200,
+                    content_type: str = "text/plain; charset=utf-8",
+                    keep_alive: bool = True) -> None:
+        head = (f"{_status_line(status)}"
+                f"Content-Type: {content_type}\r\n"
+                f"Cache-Control: no-cache\r\n"
+                f"Transfer-Encoding: chunked\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                f"\r\n")
+        self.writer.write(head.encode("latin-1"))
+        await self.writer.drain()
+
+    async def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self.writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+        await self.writer.drain()
+
+    async def end(self) -> None:
+        self.writer.write(b"0\r\n\r\n")
+        await self.writer.drain()
@@ -0,0 +1,317 @@
+"""
+Job manager running commands in the background for the API
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
+from functools import partial
+from typing import (Any, AsyncIterator, Dict, List, Optional, Set, Tuple,
+                    Union)
+
+from app.core.exceptions import JobQueueFullError
+from app.core.interfaces.command import ICommand
+from app.core.types.enums import CommandStatus
+from app.core.types.models import CommandResult
+
+
+@dataclass
+class JobRequest:
+    """
+    Command submitted as a job
+    """
+    command: Union[str, List[str]]
+    timeout: Optional[float] = None
+    env: Optional[Dict[str, str]] = None
+    cwd: Optional[str] = None
+    stdin: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "JobRequest":
+        """
+        Validate and create a job request from decoded JSON
+
+        Raises:
+            ValueError: if the data is not a valid job request
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Job request must be an object")
+        command = data.get("command")
+        if not (isinstance(command, str) and command.strip() or
+                isinstance(command, list) and command and
+                all(isinstance(part, str) for part in command)):
+            raise ValueError(
+                "command must be a non-empty string or list of strings")
+        timeout = data.get("timeout")
+        if timeout is not None and (
+                not isinstance(timeout, (int, float)) or timeout <= 0):
+            raise ValueError("timeout must be a positive number")
+        env = data.get("env")
+        if env is not None and not (
+                isinstance(env, dict) and
+                all(isinstance(v, str) for v in env.values())):
+            raise ValueError("env must be an object of strings")
+        for name in ("cwd", "stdin"):
+            if data.get(name) is not None and \
+                    not isinstance(data[name], str):
+                raise ValueError(f"{name} must be a string")
+
+        return cls(command=command,
+                   timeout=timeout,
+                   env=env,
+                   cwd=data.get("cwd"),
+                   stdin=data.get("stdin"))
+
+
+class Job:
+    """
+    Command running in the background with its streamed output
+
+    Output lines are buffered while the job runs, up to
+    ``max_output_size`` characters. Once the job is finished the buffer
+    is released and the output is served from the truncated result.
+    """
+
+    def __init__(self,
+                 job_id: str,
+                 request: JobRequest,
+                 max_output_size: int = 64 * 1024):
+        self.id = job_id
+        self.request = request
+        self.max_output_size = max_output_size
+        self.status = CommandStatus.PENDING
+        self.result: Optional[CommandResult] = None
+        self.output: List[Tuple[str, str]] = []
+        self.output_size = 0
+        self.output_truncated = False
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.result is not None
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def mark_running(self) -> None:
+        self.status = CommandStatus.RUNNING
+        self.started_at = time.time()
+        self._notify()
+
+    def append_output(self, stream: str, line: str) -> None:
+        if self.output_size + len(line) > self.max_output_size:
+            self.output_truncated = True
+            return
+        self.output_size += len(line)
+        self.output.append((stream, line))
+        self._notify()
+
+    def finish(self, result: CommandResult) -> None:
+        limit = self.max_output_size
+        if (len(result.stdout or "") > limit or
+                len(result.stderr or "") > limit):
+            self.output_truncated = True
+            result = replace(result,
+                             stdout=(result.stdout or "")[:limit],
+                             stderr=(result.stderr or "")[:limit])
+        self.result = result
+        self.status = result.status
+        # Streams already running keep their reference to the buffer
+        self.output = []
+        self.finished_at = time.time()
+        self._notify()
+
+    async def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the job is finished
+
+        Returns:
+            True if the job is finished
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not self.finished:
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return self.finished
+        return True
+
+    async def stream(self) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Yield output lines from the start until the job is finished
+        """
+        if self.finished:
+            for stream in ("stdout", "stderr"):
+                text = getattr(self.result, stream) or ""
+                for line in text.splitlines(keepends=True):
+                    yield stream, line
+            return
+
+        output = self.output
+        index = 0
+        while True:
+            changed = self._changed
+            while index < len(output):
+                yield output[index]
+                index += 1
+            if self.finished:
+                return
+            await changed.wait()
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = None
+        if self.result is not None:
+            result = asdict(self.result)
+            result["status"] = self.result.status.value
+        return {
+            "id": self.id,
+            "command": self.request.command,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": result,
+            "output_truncated": self.output_truncated,
+        }
+
+
+class JobManager:
+    """
+    Manager running jobs on a bounded thread pool
+
+    Commands block in ``ICommand.execute``, so they run in
+    ``max_concurrency`` worker threads while the event loop only tracks
+    job state. At most ``max_pending`` jobs wait for a free worker.
+    Closing cancels pending jobs and waits for the running commands.
+    """
+
+    def __init__(self,
+                 command: ICommand,
+                 max_concurrency: int = 16,
+                 max_pending: int = 1024,
+                 max_finished: int = 10000,
+                 max_output_size: int = 64 * 1024):
+        """
+        Initialize the job manager
+
+        Args:
+            command: command manager executing the jobs
+            max_concurrency: number of commands running at the same time
+            max_pending: number of jobs waiting for a worker
+            max_finished: number of finished jobs kept for polling
+            max_output_size: stdout and stderr of a job are truncated to
+                this size
+        """
+        self.command = command
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.max_output_size = max_output_size
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="job")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    @property
+    def active(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, request: JobRequest) -> Job:
+        """
+        Submit a job, must be called from the event loop
+
+        Raises:
+            JobQueueFullError: if too many jobs are running or pending
+        """
+        if self._closed:
+            raise JobQueueFullError("Job manager is closed")
+        if self.active >= self.max_concurrency + self.max_pending:
+            raise JobQueueFullError(
+                f"Too many active jobs ({self.active})")
+
+        job = Job(uuid.uuid4().hex, request, self.max_output_size)
+        self._jobs[job.id] = job
+        task = asyncio.ensure_future(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self._evict()
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def _evict(self) -> None:
+        excess = len(self._jobs) - self.active - self.max_finished
+        if excess <= 0:
+            return
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished][:excess]:
+            del self._jobs[job_id]
+
+    def _execute(self,
+                 job: Job,
+                 loop: asyncio.AbstractEventLoop) -> CommandResult:
+        if self._closed:
+            return CommandResult(
+                status=CommandStatus.CANCELLED,
+                return_code=-1,
+                command=str(job.request.command),
+                stdout="",
+                stderr="",
+                execution_time=0.0,
+                error="Job manager is closed")
+        loop.call_soon_threadsafe(job.mark_running)
+        request = job.request
+        return self.command.execute(
+            request.command,
+            timeout=request.timeout,
+            env=request.env,
+            cwd=request.cwd,
+            stdin=request.stdin,
+            on_output=partial(loop.call_soon_threadsafe, job.append_output))
+
+    async def _run(self, job: Job) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._executor, self._execute, job, loop)
+        except Exception as e:
+            result = CommandResult(
+                status=CommandStatus.FAILED,
+                return_code=-1,
+                command=str(job.request.command),
+                stdout="",
+                stderr=str(e),
+                execution_time=0.0,
+                error=str(e))
+        job.finish(result)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "active": self.active,
+            "known": len(self._jobs),
+            "max_concurrency": self.max_concurrency,
+            "max_pending": self.max_pending,
+        }
+
+    def close(self) -> None:
+        """
+        Stop accepting jobs, cancel pending ones and wait for running ones
+
+        Blocks until the running commands finished, call it from a worker
+        thread when the event loop has to keep serving.
+        """
+        self._closed = True
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,236 @@
+"""
+Asyncio HTTP server exposing command jobs
+"""
+
+import asyncio
+import hmac
+import json
+from typing import Optional
+
+from app.api.http import (ChunkedWriter, Request, json_response,
+                          read_request)
+from app.api.jobs import Job, JobManager, JobRequest
+from app.core.exceptions import HttpError, JobQueueFullError
+from app.core.interfaces.console import IConsole
+
+
+class ApiServer:
+    """
+    HTTP job API on asyncio streams
+
+    Every route except ``/health`` requires the shared secret as a
+    bearer token (``Authorization: Bearer <token>``) and answers 401
+    without it.
+
+    Routes (relative to ``prefix``):
+        GET  /health                 server and job stats
+        POST /jobs                   submit, ``"wait": true`` waits for it
+        GET  /jobs/{id}              status and result, ``?wait=N`` long-polls
+        GET  /jobs/{id}/output       output as a chunked text stream
+        GET  /jobs/{id}/events       output as server-sent events
+    """
+
+    def __init__(self,
+                 jobs: JobManager,
+                 token: str,
+                 host: str = "127.0.0.1",
+                 port: int = 8000,
+                 prefix: str = "/api/v1",
+                 keep_alive_timeout: float = 15.0,
+                 max_wait: float = 300.0,
+                 backlog: int = 4096):
+        """
+        Initialize the API server
+
+        Args:
+            jobs: job manager running the submitted commands
+            token: shared secret clients send as a bearer token
+            host: address to listen on
+            port: port to listen on, 0 picks a free port
+            prefix: path prefix of all routes
+            keep_alive_timeout: idle time before a connection is closed
+            max_wait: upper bound for waiting on a job in one request
+            backlog: listen backlog of the server socket
+        """
+        if not token:
+            raise ValueError("API token must not be empty")
+        self.jobs = jobs
+        self.token = token
+        self.host = host
+        self.port = port
+        self.prefix = prefix.rstrip("/")
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_wait = max_wait
+        self.backlog = backlog
+        self.console: IConsole = None  # Will be set DI Container
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def set_console(self,
+                    console: IConsole) -> None:
+        self.console = console
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port,
+            backlog=self.backlog)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.console:
+            self.console.info(
+                f"API listening on http://{self.host}:{self.port}"
+                f"{self.prefix}", "api")
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        # Running jobs finish on the loop, keep it running while waiting
+        await asyncio.get_running_loop().run_in_executor(None,
+                                                         self.jobs.close)
+
+    async def _handle_connection(self,
+                                 reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await asyncio.wait_for(
+                        read_request(reader), self.keep_alive_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except HttpError as e:
+                    writer.write(json_response(
+                        e.status, {"error": e.message}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                keep_alive = request.keep_alive
+                keep_alive = await self._dispatch(request, writer, keep_alive)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            if self.console:
+                self.console.error(f"Connection handler failed: {e}", "api")
+        finally:
+            writer.close()
+
+    async def _dispatch(self,
+                        request: Request,
+                        writer: asyncio.StreamWriter,
+                        keep_alive: bool) -> bool:
+        """
+        Route the request and write the response
+
+        Returns:
+            Whether the connection can be reused
+        """
+        try:
+            if not request.path.startswith(self.prefix + "/"):
+                raise HttpError(404, "Not found")
+            parts = request.path[len(self.prefix):].strip("/").split("/")
+            if parts != ["health"]:
+                self._authenticate(request)
+
+            if parts == ["health"] and request.method == "GET":
+                writer.write(json_response(
+                    200, {"status": "ok", "jobs": self.jobs.stats()},
+                    keep_alive))
+            elif parts == ["jobs"] and request.method == "POST":
+                writer.write(await self._submit(request, keep_alive))
+            elif len(parts) in (2, 3) and parts[0] == "jobs":
+                if request.method != "GET":
+                    raise HttpError(405, "Method not allowed")
+                job = self.jobs.get(parts[1])
+                if job is None:
+                    raise HttpError(404, f"Job {parts[1]} not found")
+                if len(parts) == 2:
+                    writer.write(await self._status(request, job,
+                                                    keep_alive))
+                elif parts[2] == "output":
+                    await self._stream_output(writer, job, keep_alive)
+                elif parts[2] == "events":
+                    await self._stream_events(writer, job, keep_alive)
+                else:
+                    raise HttpError(404, "Not found")
+            else:
+                raise HttpError(404, "Not found")
+        except HttpError as e:
+            writer.write(json_response(e.status, {"error": e.message},
+                                       keep_alive, e.headers))
+        await writer.drain()
+        return keep_alive
+
+    def _authenticate(self, request: Request) -> None:
+        scheme, _, credentials = request.headers.get(
+            "authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(
+                credentials.strip().encode(), self.token.encode()):
+            raise HttpError(401, "Missing or invalid bearer token",
+                            {"WWW-Authenticate": "Bearer"})
+
+    def _wait_time(self, value: object) -> float:
+        if value is True:
+            return self.max_wait
+        try:
+            return min(max(float(value), 0.0), self.max_wait)
+        except (TypeError, ValueError):
+            raise HttpError(400, f"Invalid wait value: {value!r}")
+
+    async def _submit(self,
+                      request: Request,
+                      keep_alive: bool) -> bytes:
+        data = request.json()
+        try:
+            job_request = JobRequest.from_dict(data)
+        except ValueError as e:
+            raise HttpError(400, str(e))
+        try:
+            job = self.jobs.submit(job_request)
+        except JobQueueFullError as e:
+            raise HttpError(429, str(e))
+
+        wait = data.get("wait")
+        if wait and await job.wait(self._wait_time(wait)):
+            return json_response(200, job.to_dict(), keep_alive)
+        return json_response(202, job.to_dict(), keep_alive)
+
+    async def _status(self,
+                      request: Request,
+                      job: Job,
+                      keep_alive: bool) -> bytes:
+        wait = request.query.get("wait")
+        if wait is not None:
+            await job.wait(self._wait_time(wait))
+        return json_response(200, job.to_dict(), keep_alive)
+
+    async def _stream_output(self,
+                             writer: asyncio.StreamWriter,
+                             job: Job,
+                             keep_alive: bool) -> None:
+        chunked = ChunkedWriter(writer)
+        await chunked.start(keep_alive=keep_alive)
+        async for _, line in job.stream():
+            await chunked.write(line.encode())
+        await chunked.end()
+
+    async def _stream_events(self,
+                             writer: asyncio.StreamWriter,
+                             job: Job,
+                             keep_alive: bool) -> None:
+        chunked = ChunkedWriter(writer)
+        await chunked.start(content_type="text/event-stream",
+                            keep_alive=keep_alive)
+        async for stream, line in job.stream():
+            await chunked.write(
+                f"event: {stream}\ndata: {json.dumps(line)}\n\n".encode())
+        await chunked.write(
+            f"event: done\ndata: {json.dumps(job.to_dict())}\n\n".encode())
+        await chunked.end()
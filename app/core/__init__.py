@@ -0,0 +1,34 @@
+"""
+Core package of the application
+
+Managers are imported on first attribute access, so importing the package
+does not pay for their dependencies.
+"""
+
+import importlib
+from typing import Any
+
+_LAZY_ATTRS = {
+    'BootstrapManager': 'app.core.bootstrap_manager',
+    'CommandManager': 'app.core.command_manager',
+    'ConsoleManager': 'app.core.console_manager',
+    'DIContainerManager': 'app.core.di_container_manager',
+    'ProbeManager': 'app.core.probe_manager',
+    'StateManager': 'app.core.state_manager',
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(list(globals()) + __all__)
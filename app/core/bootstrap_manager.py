@@ -0,0 +1,214 @@
+"""
+Bootstrap manager starting the application in dependency order
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import (FIRST_COMPLETED, Future, ThreadPoolExecutor,
+                                wait)
+from typing import Dict, List, Optional, Set, Tuple
+
+from app.core.di_container_manager import DIContainerManager
+from app.core.exceptions import BootstrapError, DependencyError
+from app.core.interfaces.console import IConsole
+from app.core.interfaces.di import IDIContainer
+from app.core.interfaces.initializer import IBootstrap, IInitializer
+from app.core.trace_manager import tracer
+from app.core.types.models import BootstrapReport, InitializerTiming
+
+
+class BootstrapManager(IBootstrap):
+    """
+    Manager running initializers as a dependency graph
+
+    An initializer is submitted to a thread pool as soon as all of its
+    dependencies have finished, so independent initializers overlap and
+    the startup takes as long as the slowest chain of dependencies rather
+    than the sum of all initializers. Shutdown runs sequentially in the
+    reverse order of completion, which always stops dependents first.
+    """
+
+    def __init__(self,
+                 container: Optional[IDIContainer] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize the bootstrap manager
+
+        Args:
+            container: DI container the initializers register into,
+                the global container by default
+            max_workers: number of initializers running at the same time,
+                by default all ready initializers run at once
+        """
+        self.container = (container if container is not None
+                          else DIContainerManager())
+        self.max_workers = max_workers
+        self.console: IConsole = None  # Will be set DI Container
+        self._initializers: Dict[str, IInitializer] = {}
+        self._started: List[IInitializer] = []
+        self._timings: Dict[str, InitializerTiming] = {}
+        self._report: Optional[BootstrapReport] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "BootstrapManager":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.shutdown()
+
+    def set_console(self,
+                    console: IConsole) -> None:
+        self.console = console
+
+    def add(self,
+            initializer: IInitializer) -> None:
+        if not initializer.name:
+            raise ValueError(f"Initializer {initializer!r} has no name")
+        if initializer.name in self._initializers:
+            raise ValueError(
+                f"Initializer {initializer.name} is already added")
+        self._initializers[initializer.name] = initializer
+
+    def _check_dependencies(self) -> None:
+        for name, initializer in self._initializers.items():
+            unknown = [dependency for dependency in initializer.depends_on
+                       if dependency not in self._initializers]
+            if unknown:
+                raise DependencyError(
+                    f"Initializer {name} depends on unknown "
+                    f"initializers: {', '.join(unknown)}")
+
+        # Kahn's algorithm, whatever cannot be ordered is part of a cycle
+        remaining = {name: set(initializer.depends_on)
+                     for name, initializer in self._initializers.items()}
+        ready = [name for name, deps in remaining.items() if not deps]
+        while ready:
+            done = ready.pop()
+            del remaining[done]
+            for name, deps in remaining.items():
+                if done in deps:
+                    deps.discard(done)
+                    if not deps:
+                        ready.append(name)
+        if remaining:
+            raise DependencyError(
+                f"Initializers have cyclic dependencies: "
+                f"{', '.join(sorted(remaining))}")
+
+    def _run(self,
+             initializer: IInitializer,
+             begin: float) -> None:
+        timing = InitializerTiming(name=initializer.name,
+                                   depends_on=list(initializer.depends_on),
+                                   thread=threading.current_thread().name)
+        with self._lock:
+            self._timings[initializer.name] = timing
+        start_time = time.perf_counter()
+        timing.start = start_time - begin
+        try:
+            with tracer.span("bootstrap.initialize", "bootstrap",
+                             initializer=initializer.name):
+                initializer.initialize(self.container)
+        except Exception as e:
+            timing.error = str(e) or type(e).__name__
+            raise
+        finally:
+            timing.duration = time.perf_counter() - start_time
+
+    def _critical_path(self) -> List[str]:
+        finished = {name: timing.start + timing.duration
+                    for name, timing in self._timings.items()
+                    if timing.error is None}
+        if not finished:
+            return []
+        path = [max(finished, key=finished.get)]
+        while True:
+            dependencies = [dependency for dependency
+                            in self._initializers[path[-1]].depends_on
+                            if dependency in finished]
+            if not dependencies:
+                break
+            path.append(max(dependencies, key=finished.get))
+        return path[::-1]
+
+    def start(self) -> BootstrapReport:
+        if self._started:
+            raise BootstrapError("Bootstrap is already started")
+        self._check_dependencies()
+        self._timings = {}
+
+        pending = dict(self._initializers)
+        done: Set[str] = set()
+        running: Dict[Future, str] = {}
+        failure: Optional[Tuple[str, BaseException]] = None
+        begin = time.perf_counter()
+
+        with tracer.span("bootstrap.start", "bootstrap"), ThreadPoolExecutor(
+                max_workers=self.max_workers or max(len(pending), 1),
+                thread_name_prefix="bootstrap") as executor:
+            while running or (pending and failure is None):
+                if failure is None:
+                    ready = [name for name, initializer in pending.items()
+                             if all(dependency in done
+                                    for dependency in initializer.depends_on)]
+                    for name in ready:
+                        # Every task gets its own copy of the context, so
+                        # spans opened by initializers nest under start
+                        context = contextvars.copy_context()
+                        future = executor.submit(context.run, self._run,
+                                                 pending.pop(name), begin)
+                        running[future] = name
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        if failure is None:
+                            failure = (name, error)
+                        continue
+                    done.add(name)
+                    self._started.append(self._initializers[name])
+                    if self.console:
+                        self.console.debug(
+                            f"Initialized {name} in "
+                            f"{self._timings[name].duration * 1e3:.1f} ms",
+                            "bootstrap")
+
+        self._report = BootstrapReport(
+            total_time=time.perf_counter() - begin,
+            timings=list(self._timings.values()),
+            critical_path=self._critical_path())
+
+        if failure is not None:
+            name, error = failure
+            if self.console:
+                self.console.error(f"Initializer {name} failed: {error}",
+                                   "bootstrap")
+            self.shutdown()
+            raise BootstrapError(
+                f"Initializer {name} failed: {error}") from error
+        return self._report
+
+    def shutdown(self) -> None:
+        started, self._started = self._started, []
+        for initializer in reversed(started):
+            start_time = time.perf_counter()
+            try:
+                with tracer.span("bootstrap.shutdown", "bootstrap",
+                                 initializer=initializer.name):
+                    initializer.shutdown(self.container)
+            except Exception as e:
+                if self.console:
+                    self.console.error(
+                        f"Shutdown of {initializer.name} failed: {e}",
+                        "bootstrap")
+            timing = self._timings.get(initializer.name)
+            if timing is not None:
+                timing.shutdown_time = time.perf_counter() - start_time
+
+    @property
+    def report(self) -> Optional[BootstrapReport]:
+        return self._report
@@ -0,0 +1,78 @@
+"""
+Base class of command managers
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+from app.core.interfaces.command import ICommand
+from app.core.interfaces.console import IConsole
+from app.core.interfaces.state import IStateStore
+from app.core.types.models import CommandResult
+
+
+class BaseCommandManager(ICommand):
+    """
+    Sudo handling and wiring shared by the local and remote managers
+    """
+
+    def __init__(self,
+                 use_sudo: bool = False,
+                 sudo_user: Optional[str] = None):
+        """
+        Initialize the command manager
+
+        Args:
+            use_sudo: whether execute commands with sudo
+            sudo_user: user to run the command as
+        """
+        self.use_sudo = use_sudo
+        self.sudo_user = sudo_user
+        self.console: IConsole = None  # Will be set DI Container
+        self.state: IStateStore = None  # Will be set DI Container
+
+    def set_console(self,
+                    console: IConsole) -> None:
+        self.console = console
+
+    def set_state(self,
+                  state: IStateStore) -> None:
+        self.state = state
+
+    def _build_command(self,
+                       command: Union[str, List[str]]) -> List[str]:
+        if isinstance(command, str):
+            command_parts = command.split()
+        else:
+            command_parts = command
+
+        if self.use_sudo:
+            sudo_command = ["sudo"]
+            if self.sudo_user:
+                sudo_command.extend(["-u", self.sudo_user])
+            return sudo_command + command_parts
+        return command_parts
+
+    def _record(self,
+                result: CommandResult,
+                metadata: Dict[str, Any]) -> None:
+        # A broken state store must not fail the command itself
+        try:
+            self.state.record(result, metadata)
+        except Exception as e:
+            if self.console:
+                self.console.error(f"Failed to record command result: {e}")
+
+    def execute_sudo(self,
+                     command: Union[str, List[str]],
+                     sudo_user: Optional[str] = None,
+                     **kwargs) -> CommandResult:
+        original_sudo = self.use_sudo
+        original_user = self.sudo_user
+
+        try:
+            self.use_sudo = True
+            self.sudo_user = sudo_user
+            return self.execute(command, **kwargs)
+        finally:
+            self.use_sudo = original_sudo
+            self.sudo_user = original_user
@@ -2,78 +2,222 @@
 Command Manager
 """
 
-import subprocess
+import os
+import threading
 import time
-from typing import Optional, List, Union, Dict
+from typing import Optional, List, Union, Dict, Iterable, Iterator, Tuple, Any
 
-from app.core.types.models import CommandResult
+from app.core.types.models import (CommandResult, StdinChunk, StdinSource,
+                                   OutputCallback)
 from app.core.types.enums import CommandStatus
-from app.core.interfaces.command import ICommand
-from app.core.interfaces.console import IConsole
+from app.core.command_base import BaseCommandManager
+from app.core.trace_manager import tracer
 
 
-class CommandManager(ICommand):
+STDIN_CHUNK_SIZE = 64 * 1024
+
+
+class CommandManager(BaseCommandManager):
     """
     Manager for executing shell commands with sudo support
     """
-    def __init__(self,
-                 use_sudo: bool = False,
-                 sudo_user: Optional[str] = None):
+
+    @staticmethod
+    def _read_chunks(stream: Any) -> Iterator[StdinChunk]:
+        while True:
+            chunk = stream.read(STDIN_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def _resolve_stdin(self,
+                       stdin: Optional[StdinSource]
+                       ) -> Tuple[Any, Optional[Iterable], Optional[int]]:
         """
-        Initialize the command manager
+        Map the stdin source to Popen arguments
+
+        Returns:
+            Tuple of the Popen stdin argument, chunks to stream into the
+            pipe and a file descriptor to close once the process is spawned
+        """
+        import subprocess
+
+        if stdin is None:
+            return None, None, None
+        if isinstance(stdin, (bytes, bytearray, memoryview, str)):
+            return subprocess.PIPE, (stdin,), None
+        if isinstance(stdin, os.PathLike):
+            fd = os.open(stdin, os.O_RDONLY)
+            return fd, None, fd
+        if isinstance(stdin, int) and not isinstance(stdin, bool):
+            return stdin, None, None
+        if hasattr(stdin, 'read'):
+            try:
+                return stdin.fileno(), None, None
+            except (AttributeError, OSError, ValueError):
+                return subprocess.PIPE, self._read_chunks(stdin), None
+        if hasattr(stdin, '__iter__') or hasattr(stdin, '__aiter__'):
+            return subprocess.PIPE, stdin, None
+        raise TypeError(f"Unsupported stdin type: {type(stdin)}")
+
+    @staticmethod
+    def _write_chunk(fd: int,
+                     chunk: StdinChunk) -> None:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        view = memoryview(chunk).cast('B')
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
 
-        Args:
-            use_sudo: whether execute commands with sudo
-            sudo_user: user to run the command as
+    def _feed_stdin(self,
+                    pipe: Any,
+                    chunks: Iterable,
+                    errors: List[BaseException]) -> None:
         """
-        self.use_sudo = use_sudo
-        self.sudo_user = sudo_user
-        self.console: IConsole = None  # Will be set DI Container
-
-    def set_console(self,
-                    console: IConsole) -> None:
-        self.console = console
-
-    def _build_command(self,
-                       command: Union[str, List[str]]) -> List[str]:
-        if isinstance(command, str):
-            command_parts = command.split()
-        else:
-            command_parts = command
-
-        if self.use_sudo:
-            sudo_command = ["sudo"]
-            if self.sudo_user:
-                sudo_command.extend(["-u", self.sudo_user])
-            return sudo_command + command_parts
-        return command_parts
+        Write chunks to the stdin pipe of the process
+
+        Writes block while the pipe is full, so the producer is throttled
+        to the speed of the consumer. Async iterators are drained on a
+        private event loop of the feeder thread, so they must not await
+        anything bound to another event loop.
+        """
+        fd = pipe.fileno()
+        try:
+            if hasattr(chunks, '__aiter__'):
+                import asyncio
+
+                async def drain() -> None:
+                    async for chunk in chunks:
+                        self._write_chunk(fd, chunk)
+
+                asyncio.run(drain())
+            else:
+                for chunk in chunks:
+                    self._write_chunk(fd, chunk)
+        except BrokenPipeError:
+            pass
+        except Exception as e:
+            errors.append(e)
+        finally:
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    def _stream_output(self,
+                       process: Any,
+                       on_output: OutputCallback,
+                       timeout: Optional[float]) -> Tuple[str, str]:
+        """
+        Read stdout and stderr line by line, passing lines to the callback
+
+        Raises:
+            subprocess.TimeoutExpired: if the process does not exit in time
+        """
+        buffers: Dict[str, List[str]] = {"stdout": [], "stderr": []}
+
+        def pump(name: str, stream: Any) -> None:
+            for line in iter(stream.readline, ""):
+                buffers[name].append(line)
+                try:
+                    on_output(name, line)
+                except Exception as e:
+                    if self.console:
+                        self.console.error(f"Output callback failed: {e}")
+            stream.close()
+
+        readers = [
+            threading.Thread(target=pump, args=(name, stream), daemon=True)
+            for name, stream in (("stdout", process.stdout),
+                                 ("stderr", process.stderr))
+        ]
+        for reader in readers:
+            reader.start()
+
+        process.wait(timeout=timeout)
+        for reader in readers:
+            reader.join()
+        return "".join(buffers["stdout"]), "".join(buffers["stderr"])
 
     def execute(self,
                 command: Union[str, List[str]],
                 timeout: Optional[float] = None,
                 env: Optional[Dict[str, str]] = None,
                 cwd: Optional[str] = None,
-                shell: bool = False) -> CommandResult:
+                shell: bool = False,
+                stdin: Optional[StdinSource] = None,
+                on_output: Optional[OutputCallback] = None) -> CommandResult:
+        with tracer.span("command.execute", "command") as span:
+            result = self._execute(command, timeout, env, cwd, shell, stdin,
+                                   on_output)
+            span.set("command", result.command)
+            span.set("status", result.status.value)
+            if self.state:
+                with tracer.span("state.record", "state"):
+                    self._record(result, {"cwd": cwd, "sudo": self.use_sudo})
+        return result
+
+    def _execute(self,
+                 command: Union[str, List[str]],
+                 timeout: Optional[float],
+                 env: Optional[Dict[str, str]],
+                 cwd: Optional[str],
+                 shell: bool,
+                 stdin: Optional[StdinSource],
+                 on_output: Optional[OutputCallback]) -> CommandResult:
+        import subprocess
+
         start_time = time.time()
 
         try:
-            command_parts = self._build_command(command)
+            with tracer.span("command.build", "command"):
+                command_parts = self._build_command(command)
             if self.console:
                 self.console.debug(
                     f"Executing command: {' '.join(command_parts)}")
 
-            process = subprocess.Popen(
-                command_parts,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                cwd=cwd,
-                env=env,
-                shell=shell
-            )
+            with tracer.span("command.spawn", "command"):
+                popen_stdin, chunks, owned_fd = self._resolve_stdin(stdin)
+                try:
+                    process = subprocess.Popen(
+                        command_parts,
+                        stdin=popen_stdin,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        text=True,
+                        cwd=cwd,
+                        env=env,
+                        shell=shell
+                    )
+                finally:
+                    if owned_fd is not None:
+                        os.close(owned_fd)
+
+            feeder = None
+            feed_errors: List[BaseException] = []
+            if chunks is not None:
+                # communicate() must only read, the feeder owns the pipe
+                pipe, process.stdin = process.stdin, None
+                feeder = threading.Thread(
+                    target=self._feed_stdin,
+                    args=(pipe, chunks, feed_errors),
+                    daemon=True)
+                feeder.start()
 
             try:
-                stdout, stderr = process.communicate(timeout=timeout)
+                # Waiting includes reading and decoding the output
+                with tracer.span("command.wait", "command"):
+                    if on_output is None:
+                        stdout, stderr = process.communicate(
+                            timeout=timeout)
+                    else:
+                        stdout, stderr = self._stream_output(
+                            process, on_output, timeout)
+                if feeder:
+                    feeder.join()
+                if feed_errors:
+                    raise feed_errors[0]
                 execution_time = time.time() - start_time
 
                 if process.returncode == 0:
@@ -135,18 +279,3 @@ class CommandManager(ICommand):
                 execution_time=execution_time,
                 error=str(e)
             )
-
-    def execute_sudo(self,
-                     command: Union[str, List[str]],
-                     sudo_user: Optional[str] = None,
-                     **kwargs) -> CommandResult:
-        original_sudo = self.use_sudo
-        original_user = self.sudo_user
-
-        try:
-            self.use_sudo = True
-            self.sudo_user = sudo_user
-            return self.execute(command, **kwargs)
-        finally:
-            self.use_sudo = original_sudo
-            self.sudo_user = original_user
@@ -0,0 +1,135 @@
+"""
+Configuration of the application
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Dict, Mapping, Optional
+
+from app.core.exceptions import ConfigError
+
+MIN_TOKEN_LENGTH = 32
+
+# Example values published with the repository
+PLACEHOLDER_TOKENS = frozenset({"your-secret-key-here", "changeme",
+                                "change-me", "secret"})
+
+
+def load_env_file(path: str) -> Dict[str, str]:
+    """
+    Parse a .env file
+
+    Empty lines, comments and inline comments after `` #`` are skipped.
+
+    Args:
+        path: path to the .env file
+
+    Returns:
+        Dict of variables, empty if the file does not exist
+    """
+    values: Dict[str, str] = {}
+    if not os.path.exists(path):
+        return values
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.split(" #", 1)[0].strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip().strip("'\"")
+    return values
+
+
+def check_token(token: str,
+                name: str) -> str:
+    """
+    Check a token guarding remote command execution
+
+    Args:
+        token: value of the setting
+        name: name of the setting, used in the error message
+
+    Raises:
+        ConfigError: if the token is empty, a published placeholder or
+            shorter than ``MIN_TOKEN_LENGTH``
+
+    Returns:
+        The token
+    """
+    if not token:
+        problem = "is not set"
+    elif token.lower() in PLACEHOLDER_TOKENS:
+        problem = "is the example placeholder"
+    elif len(token) < MIN_TOKEN_LENGTH:
+        problem = f"is shorter than {MIN_TOKEN_LENGTH} characters"
+    else:
+        return token
+    raise ConfigError(
+        f"{name} {problem}, generate one with: python -c "
+        f"'import secrets; print(secrets.token_urlsafe(32))'")
+
+
+@dataclass
+class Settings:
+    """
+    Settings of the application
+    """
+    app_name: str = "App"
+    app_env: str = "development"
+    debug: bool = False
+    api_host: str = "127.0.0.1"
+    api_port: int = 8000
+    api_token: str = ""
+    api_prefix: str = "/api"
+    api_version: str = "v1"
+    log_level: str = "INFO"
+    state_db: str = ""
+    state_max_age: float = 30 * 24 * 3600.0
+    state_max_rows: int = 100000
+    agent_token: str = ""
+    trace: bool = False
+    trace_sample_rate: float = 1.0
+    trace_file: str = ""
+
+    @classmethod
+    def from_env(cls,
+                 environ: Optional[Mapping[str, str]] = None,
+                 env_file: Optional[str] = None) -> "Settings":
+        """
+        Create settings from environment variables
+
+        Args:
+            environ: variables to use instead of os.environ
+            env_file: .env file with defaults, overridden by environ
+
+        Returns:
+            Settings object
+        """
+        values = load_env_file(env_file) if env_file else {}
+        values.update(os.environ if environ is None else environ)
+        defaults = cls()
+
+        return cls(
+            app_name=values.get("APP_NAME", defaults.app_name),
+            app_env=values.get("APP_ENV", defaults.app_env),
+            debug=values.get("DEBUG", str(defaults.debug)).lower()
+            in ("1", "true", "yes"),
+            api_host=values.get("API_HOST", defaults.api_host),
+            api_port=int(values.get("API_PORT", defaults.api_port)),
+            api_token=values.get("API_TOKEN", defaults.api_token),
+            api_prefix=values.get("API_PREFIX", defaults.api_prefix),
+            api_version=values.get("API_VERSION", defaults.api_version),
+            log_level=values.get("LOG_LEVEL", defaults.log_level),
+            state_db=values.get("STATE_DB", defaults.state_db),
+            state_max_age=float(values.get("STATE_MAX_AGE",
+                                           defaults.state_max_age)),
+            state_max_rows=int(values.get("STATE_MAX_ROWS",
+                                          defaults.state_max_rows)),
+            agent_token=values.get("AGENT_TOKEN", defaults.agent_token),
+            trace=values.get("TRACE", str(defaults.trace)).lower()
+            in ("1", "true", "yes"),
+            trace_sample_rate=float(values.get("TRACE_SAMPLE_RATE",
+                                               defaults.trace_sample_rate)),
+            trace_file=values.get("TRACE_FILE", defaults.trace_file),
+        )
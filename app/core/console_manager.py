@@ -2,11 +2,14 @@
 Console manager for the application
 """
 
-from rich.console import Console
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
 from app.core.interfaces.console import IConsole
 from app.core.types.enums import ConsoleLevel
+from app.core.trace_manager import NOOP_SPAN, tracer
+
+if TYPE_CHECKING:
+    from rich.console import Console
 
 
 class ConsoleManager(IConsole):
@@ -17,18 +20,35 @@ class ConsoleManager(IConsole):
     def __init__(self, app_name: str, debug: bool = False):
         """
         Initialize the console manager
+
+        The rich console is created on first output, so processes that
+        never print do not pay for importing rich.
         """
-        self.console = Console()
+        self._console: Optional["Console"] = None
         self.app_name = app_name if app_name else "App"
         self.debug_mode = debug
 
+    @property
+    def console(self) -> "Console":
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+
+    @console.setter
+    def console(self, console: "Console") -> None:
+        self._console = console
+
     def _log(self,
              message: str,
              level: ConsoleLevel,
              module_prefix: Optional[str] = None) -> None:
-        prefix = f"[{module_prefix}] " if module_prefix else ""
-        self.console.print(f"[{level.value}] [{self.app_name}] {prefix}"
-                           f"{message} [/{level.value}]")
+        span = (tracer.span("console.log", "console", level=level.name)
+                if tracer.enabled else NOOP_SPAN)
+        with span:
+            prefix = f"[{module_prefix}] " if module_prefix else ""
+            self.console.print(f"[{level.value}] [{self.app_name}] {prefix}"
+                               f"{message} [/{level.value}]")
 
     def info(self,
              message: str,
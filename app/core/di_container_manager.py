@@ -2,35 +2,66 @@
 Manager for dependency injection container
 """
 
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import replace
+from typing import (Dict, Type, TypeVar, Optional, Callable, Iterator,
+                    Tuple)
+
 from app.core.interfaces.di import IDIContainer
-from typing import Dict, Type, TypeVar, Optional, Callable
+from app.core.exceptions import DIContainerError, ScopeNotActiveError
+from app.core.types.enums import ServiceLifetime
+from app.core.types.models import ServiceStats
+from app.core.trace_manager import NOOP_SPAN, tracer
 
 T = TypeVar('T')
 
+# Cached result of a singleton factory that returned None
+_NONE = object()
+
 
 class DIContainerManager(IDIContainer):
     """
     Singleton manager for dependency injection container
+
+    Instances and resolved singletons live in ``_services`` which is
+    read without locking, so lookups after the first resolution are
+    lock-free. Writes go through ``_lock``. Singleton factories run under
+    a lock of their own service type with double-checked locking, so they
+    run exactly once without blocking other services or registrations.
     """
 
     _instance: Optional[IDIContainer] = None
+    _instance_lock = threading.Lock()
+    _scope = ContextVar('di_scope', default=None)
 
-    def __init__(self) -> None:
-        if not hasattr(self, '_services'):
-            self._services: Dict[Type[T], T] = {}
-        if not hasattr(self, '_factories'):
-            self._factories: Dict[Type[T], Callable[[], T]] = {}
+    _services: Dict[Type[T], T]
+    _factories: Dict[Type[T], Tuple[Callable[[], T], ServiceLifetime]]
+    _stats: Dict[Type[T], ServiceStats]
+    _type_locks: Dict[Type[T], threading.Lock]
 
     def __new__(cls) -> IDIContainer:
         if cls._instance is None:
-            cls._instance = super(DIContainerManager, cls).__new__(cls)
+            with cls._instance_lock:
+                if cls._instance is None:
+                    instance = super(DIContainerManager, cls).__new__(cls)
+                    instance._services = {}
+                    instance._factories = {}
+                    instance._stats = {}
+                    instance._type_locks = {}
+                    instance._lock = threading.RLock()
+                    cls._instance = instance
         return cls._instance
 
     def register(self,
                  service_type: Type[T],
                  instance: T) -> None:
         if isinstance(instance, service_type):
-            self._services[service_type] = instance
+            with self._lock:
+                self._factories.pop(service_type, None)
+                self._services[service_type] = instance
         else:
             raise ValueError(
                 f"Instance of {type(service_type)} "
@@ -38,20 +69,98 @@ class DIContainerManager(IDIContainer):
 
     def register_factory(self,
                          service_type: Type[T],
-                         factory: Callable[[], T]) -> None:
-        self._factories[service_type] = factory
+                         factory: Callable[[], T],
+                         lifetime: ServiceLifetime = ServiceLifetime.TRANSIENT
+                         ) -> None:
+        with self._lock:
+            if (service_type in self._services and
+                    service_type not in self._factories):
+                raise DIContainerError(
+                    f"Service {service_type} is registered as an instance, "
+                    f"remove it before registering a factory")
+            self._services.pop(service_type, None)
+            self._factories[service_type] = (factory, lifetime)
+
+    def _create(self,
+                service_type: Type[T],
+                factory: Callable[[], T]) -> T:
+        # Attributes are only built while tracing is enabled
+        span = (tracer.span("di.resolve", "di",
+                            service=getattr(service_type, "__name__",
+                                            str(service_type)))
+                if tracer.enabled else NOOP_SPAN)
+        with span:
+            start_time = time.perf_counter()
+            instance = factory()
+            elapsed = time.perf_counter() - start_time
+
+        with self._lock:
+            stats = self._stats.get(service_type)
+            if stats is None:
+                stats = self._stats[service_type] = ServiceStats()
+            stats.record(elapsed)
+        return instance
 
     def get(self,
             service_type: Type[T]) -> Optional[T]:
-
-        if service_type in self._services:
-            return self._services[service_type]
-
-        if service_type in self._factories:
-            instance = self._factories[service_type]()
-            return instance
-
-        return None
+        instance = self._services.get(service_type)
+        if instance is not None:
+            return None if instance is _NONE else instance
+
+        registration = self._factories.get(service_type)
+        if registration is None:
+            return None
+        factory, lifetime = registration
+
+        if lifetime is ServiceLifetime.SINGLETON:
+            return self._get_singleton(service_type, registration)
+
+        if lifetime is ServiceLifetime.SCOPED:
+            scope = self._scope.get()
+            if scope is None:
+                raise ScopeNotActiveError(
+                    f"Scoped service {service_type} "
+                    f"requested outside of a scope")
+            if service_type not in scope:
+                scope[service_type] = self._create(service_type, factory)
+            return scope[service_type]
+
+        return self._create(service_type, factory)
+
+    def _get_singleton(self,
+                       service_type: Type[T],
+                       registration: Tuple[Callable[[], T], ServiceLifetime]
+                       ) -> Optional[T]:
+        with self._lock:
+            type_lock = self._type_locks.get(service_type)
+            if type_lock is None:
+                type_lock = self._type_locks[service_type] = threading.Lock()
+
+        with type_lock:
+            instance = self._services.get(service_type)
+            if instance is None:
+                instance = self._create(service_type, registration[0])
+                if instance is None:
+                    instance = _NONE
+                with self._lock:
+                    # Keep the instance only if the factory was not
+                    # replaced or removed while it was running
+                    if self._factories.get(service_type) is registration:
+                        self._services[service_type] = instance
+        return None if instance is _NONE else instance
+
+    @contextmanager
+    def create_scope(self) -> Iterator[None]:
+        token = self._scope.set({})
+        try:
+            yield
+        finally:
+            self._scope.reset(token)
+
+    def get_stats(self) -> Dict[Type, ServiceStats]:
+        with self._lock:
+            return {service_type: replace(stats)
+                    for service_type, stats in self._stats.items()}
 
     def has(self,
             service_type: Type[T]) -> bool:
@@ -60,11 +169,15 @@ class DIContainerManager(IDIContainer):
 
     def remove(self,
                service_type: Type[T]) -> None:
-        if service_type in self._services:
-            del self._services[service_type]
-        if service_type in self._factories:
-            del self._factories[service_type]
+        with self._lock:
+            self._services.pop(service_type, None)
+            self._factories.pop(service_type, None)
+            self._stats.pop(service_type, None)
+            self._type_locks.pop(service_type, None)
 
     def clear(self) -> None:
-        self._services.clear()
-        self._factories.clear()
+        with self._lock:
+            self._services.clear()
+            self._factories.clear()
+            self._stats.clear()
+            self._type_locks.clear()
@@ -0,0 +1,56 @@
+"""
+Exceptions for the core package
+"""
+
+from typing import Dict, Optional
+
+
+class DIContainerError(Exception):
+    """
+    Base error of the dependency injection container
+    """
+
+
+class ScopeNotActiveError(DIContainerError):
+    """
+    Scoped service was requested outside of an active scope
+    """
+
+
+class JobQueueFullError(Exception):
+    """
+    Job could not be accepted because the queue is full
+    """
+
+
+class HttpError(Exception):
+    """
+    Error answered to an HTTP client with the given status
+    """
+
+    def __init__(self,
+                 status: int,
+                 message: str,
+                 headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers
+
+
+class ConfigError(Exception):
+    """
+    Setting is missing or has an unsafe value
+    """
+
+
+class BootstrapError(Exception):
+    """
+    Application bootstrap failed
+    """
+
+
+class DependencyError(BootstrapError):
+    """
+    Initializer dependencies are unknown or form a cycle
+    """
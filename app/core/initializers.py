@@ -0,0 +1,199 @@
+"""
+Initializers of the core components
+"""
+
+from typing import List, Mapping, Optional
+
+from app.core.config import Settings
+from app.core.interfaces.command import ICommand
+from app.core.interfaces.console import IConsole
+from app.core.interfaces.di import IDIContainer
+from app.core.interfaces.initializer import IInitializer
+from app.core.interfaces.probe import IProbe
+from app.core.interfaces.state import IStateStore
+from app.core.trace_manager import TraceManager, tracer
+
+
+class SettingsInitializer(IInitializer):
+    """
+    Load the settings from the environment
+    """
+    name = "settings"
+
+    def __init__(self,
+                 environ: Optional[Mapping[str, str]] = None,
+                 env_file: Optional[str] = ".env"):
+        """
+        Initialize the settings initializer
+
+        Args:
+            environ: variables to use instead of os.environ
+            env_file: .env file with defaults, overridden by environ
+        """
+        self.environ = environ
+        self.env_file = env_file
+
+    def initialize(self,
+                   container: IDIContainer) -> None:
+        container.register(Settings,
+                           Settings.from_env(self.environ, self.env_file))
+
+    def shutdown(self,
+                 container: IDIContainer) -> None:
+        container.remove(Settings)
+
+
+class TracingInitializer(IInitializer):
+    """
+    Configure the tracer from ``TRACE`` and ``TRACE_SAMPLE_RATE``
+
+    Runs before the other components so their startup is traced. On
+    shutdown, after everything else has stopped, the spans are written to
+    ``TRACE_FILE`` in the Chrome trace-event format.
+    """
+    name = "tracing"
+    depends_on = ("settings",)
+
+    def __init__(self, manager: TraceManager = tracer):
+        """
+        Initialize the tracing initializer
+
+        Args:
+            manager: tracer to configure, the process-wide one by default
+        """
+        self.manager = manager
+
+    def initialize(self,
+                   container: IDIContainer) -> None:
+        settings = container.get(Settings)
+        if settings.trace:
+            self.manager.configure(True, settings.trace_sample_rate)
+
+    def shutdown(self,
+                 container: IDIContainer) -> None:
+        if not self.manager.enabled:
+            return
+        settings = container.get(Settings)
+        self.manager.configure(False)
+        if settings is not None and settings.trace_file:
+            self.manager.export_chrome_trace(settings.trace_file)
+        self.manager.clear()
+
+
+class ConsoleInitializer(IInitializer):
+    """
+    Set up the console used as the log sink
+    """
+    name = "console"
+    depends_on = ("tracing",)
+
+    def initialize(self,
+                   container: IDIContainer) -> None:
+        from app.core.console_manager import ConsoleManager
+
+        settings = container.get(Settings)
+        # rich is imported on the first message, not during startup
+        container.register(IConsole,
+                           ConsoleManager(settings.app_name, settings.debug))
+
+    def shutdown(self,
+                 container: IDIContainer) -> None:
+        container.remove(IConsole)
+
+
+class StateInitializer(IInitializer):
+    """
+    Open the command history database, skipped without ``STATE_DB``
+
+    ``STATE_MAX_AGE`` (seconds) and ``STATE_MAX_ROWS`` limit the history,
+    0 disables a limit.
+    """
+    name = "state"
+    depends_on = ("tracing",)
+
+    def initialize(self,
+                   container: IDIContainer) -> None:
+        settings = container.get(Settings)
+        if not settings.state_db:
+            return
+
+        from app.core.state_manager import StateManager
+
+        container.register(IStateStore, StateManager(
+            settings.state_db,
+            max_age=settings.state_max_age or None,
+            max_rows=settings.state_max_rows or None))
+
+    def shutdown(self,
+                 container: IDIContainer) -> None:
+        state = container.get(IStateStore)
+        if state is not None:
+            container.remove(IStateStore)
+            state.close()
+
+
+class ProbeInitializer(IInitializer):
+    """
+    Open the system probes and warm their descriptor cache
+    """
+    name = "probe"
+    depends_on = ("tracing",)
+
+    def initialize(self,
+                   container: IDIContainer) -> None:
+        from app.core.probe_manager import ProbeManager
+
+        probe = ProbeManager()
+        probe.warm()
+        container.register(IProbe, probe)
+
+    def shutdown(self,
+                 container: IDIContainer) -> None:
+        probe = container.get(IProbe)
+        if probe is not None:
+            container.remove(IProbe)
+            probe.close()
+
+
+class CommandInitializer(IInitializer):
+    """
+    Create the command manager wired to the console and the state store
+    """
+    name = "command"
+    depends_on = ("console", "state")
+
+    def initialize(self,
+                   container: IDIContainer) -> None:
+        from app.core.command_manager import CommandManager
+
+        command = CommandManager()
+        command.set_console(container.get(IConsole))
+        command.set_state(container.get(IStateStore))
+        container.register(ICommand, command)
+
+    def shutdown(self,
+                 container: IDIContainer) -> None:
+        container.remove(ICommand)
+
+
+def default_initializers(environ: Optional[Mapping[str, str]] = None,
+                         env_file: Optional[str] = ".env"
+                         ) -> List[IInitializer]:
+    """
+    Get the initializers of all core components
+
+    Args:
+        environ: variables to use instead of os.environ
+        env_file: .env file with defaults, overridden by environ
+
+    Returns:
+        List of initializers
+    """
+    return [
+        SettingsInitializer(environ, env_file),
+        TracingInitializer(),
+        ConsoleInitializer(),
+        StateInitializer(),
+        ProbeInitializer(),
+        CommandInitializer(),
+    ]
@@ -5,8 +5,10 @@ Interface for commands
 from abc import ABC, abstractmethod
 from typing import Optional, Union, List, Dict
 
-from app.core.types.models import CommandResult
+from app.core.types.models import (CommandResult, StdinSource,
+                                   OutputCallback)
 from app.core.interfaces.console import IConsole
+from app.core.interfaces.state import IStateStore
 
 
 class ICommand(ABC):
@@ -24,6 +26,16 @@ class ICommand(ABC):
         """
         pass
 
+    @abstractmethod
+    def set_state(self, state: IStateStore) -> None:
+        """
+        Set the state store where command results are recorded
+
+        Args:
+            state: IStateStore
+        """
+        pass
+
     @abstractmethod
     def _build_command(self,
                        command: Union[str, List[str]] = None) -> List[str]:
@@ -44,7 +56,9 @@ class ICommand(ABC):
                 timeout: Optional[float] = None,
                 env: Optional[Dict[str, str]] = None,
                 cwd: Optional[str] = None,
-                shell: bool = False) -> CommandResult:
+                shell: bool = False,
+                stdin: Optional[StdinSource] = None,
+                on_output: Optional[OutputCallback] = None) -> CommandResult:
         """
         Execute the command and return results
 
@@ -53,6 +67,17 @@ class ICommand(ABC):
             timeout: timeout for the command
             env: environment variables
             cwd: working directory
+            shell: whether to run the command through the shell
+            stdin: input for the command. bytes or str are written as is,
+                a path, file descriptor or binary file is passed to the
+                process directly, an iterator or async iterator of chunks
+                is streamed while the output is being read. Async
+                iterators are drained on a private event loop, so only
+                self-contained ones such as async generators are
+                supported; objects bound to the caller's loop
+                (StreamReader, asyncio.Queue) cannot be awaited there
+            on_output: called from a reader thread with the stream name
+                and each line of output as soon as it is produced
 
         Returns:
             CommandResult object with the results of the command
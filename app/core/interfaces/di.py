@@ -3,7 +3,11 @@ Interface for dependency injection
 """
 
 from abc import ABC, abstractmethod
-from typing import Type, TypeVar, Optional, Callable
+from typing import (Type, TypeVar, Optional, Callable, ContextManager,
+                    Dict)
+
+from app.core.types.enums import ServiceLifetime
+from app.core.types.models import ServiceStats
 
 T = TypeVar('T')
 
@@ -20,6 +24,8 @@ class IDIContainer(ABC):
         """
         Register a service in the container
 
+        Replaces a factory registered for the service type.
+
         Args:
             service_type: Type of the service to register
             instance: Instance of the service to register
@@ -29,13 +35,23 @@ class IDIContainer(ABC):
     @abstractmethod
     def register_factory(self,
                          service_type: Type[T],
-                         factory: Callable[[], T]) -> None:
+                         factory: Callable[[], T],
+                         lifetime: ServiceLifetime = ServiceLifetime.TRANSIENT
+                         ) -> None:
         """
         Register a factory for a service in the container
 
+        Replaces a factory registered before and drops the singleton it
+        created.
+
         Args:
             service_type: Type of the service to register
             factory: Factory function to create the service
+            lifetime: How long a created instance is reused
+
+        Raises:
+            DIContainerError: if an instance of the service is registered,
+                it has to be removed first
         """
         pass
 
@@ -47,6 +63,10 @@ class IDIContainer(ABC):
 
         Args:
             service_type: Type of the service to get
+
+        Raises:
+            ScopeNotActiveError: if a scoped service is requested
+                outside of a scope
         """
         pass
 
@@ -78,3 +98,26 @@ class IDIContainer(ABC):
         Clear all services from the container
         """
         pass
+
+    @abstractmethod
+    def create_scope(self) -> ContextManager[None]:
+        """
+        Open a scope for scoped services
+
+        Scoped services resolved inside the scope are created once and
+        shared by everything running in the same context: the calling
+        thread and asyncio tasks created inside the scope. Threads do not
+        inherit the context, run them through ``contextvars.copy_context``
+        to share the scope, otherwise they get ``ScopeNotActiveError``.
+        """
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> Dict[Type, ServiceStats]:
+        """
+        Get resolution statistics per service type
+
+        Returns:
+            Snapshot of the statistics of factory resolutions
+        """
+        pass
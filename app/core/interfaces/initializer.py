@@ -0,0 +1,99 @@
+"""
+Interface for application initializers
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional, Sequence
+
+from app.core.interfaces.di import IDIContainer
+from app.core.types.models import BootstrapReport
+
+
+class IInitializer(ABC):
+    """
+    Interface for a component started during the application bootstrap
+
+    Initializers declare the names of the initializers they depend on;
+    initializers whose dependencies are satisfied run concurrently.
+    """
+
+    name: str = ""
+    depends_on: Sequence[str] = ()
+
+    @abstractmethod
+    def initialize(self,
+                   container: IDIContainer) -> None:
+        """
+        Start the component and register its services
+
+        Args:
+            container: DI container holding the services registered by
+                the dependencies
+        """
+        pass
+
+    @abstractmethod
+    def shutdown(self,
+                 container: IDIContainer) -> None:
+        """
+        Stop the component and release its resources
+
+        Called after every initializer depending on this one is shut down.
+
+        Args:
+            container: DI container
+        """
+        pass
+
+
+class IBootstrap(ABC):
+    """
+    Interface for starting and stopping the application
+    """
+
+    @abstractmethod
+    def add(self,
+            initializer: IInitializer) -> None:
+        """
+        Add an initializer to the bootstrap
+
+        Args:
+            initializer: Initializer to add
+
+        Raises:
+            ValueError: if an initializer with the same name was added
+        """
+        pass
+
+    @abstractmethod
+    def start(self) -> BootstrapReport:
+        """
+        Run all initializers in dependency order
+
+        Raises:
+            DependencyError: if dependencies are unknown or form a cycle
+            BootstrapError: if an initializer failed, the initializers
+                started before are shut down
+
+        Returns:
+            Timing report of the startup
+        """
+        pass
+
+    @abstractmethod
+    def shutdown(self) -> None:
+        """
+        Shut down the started initializers in reverse order
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def report(self) -> Optional[BootstrapReport]:
+        """
+        Timing report of the last startup, including shutdown times
+
+        Returns:
+            BootstrapReport or None if the bootstrap was not started
+        """
+        pass
@@ -0,0 +1,111 @@
+"""
+Interface for system probes
+"""
+
+from abc import ABC, abstractmethod
+from typing import List
+
+from app.core.types.models import (DiskUsage, LoadAverage, MemoryInfo,
+                                   ProcessInfo, SystemSnapshot, UptimeInfo)
+
+
+class IProbe(ABC):
+    """
+    Interface for reading system state without spawning commands
+    """
+
+    @abstractmethod
+    def read(self, path: str) -> str:
+        """
+        Read a pseudo file, the equivalent of ``cat /proc/...``
+
+        Args:
+            path: path of the file
+
+        Returns:
+            Content of the file
+        """
+        pass
+
+    @abstractmethod
+    def load_average(self) -> LoadAverage:
+        """
+        Get the system load average
+
+        Returns:
+            LoadAverage object
+        """
+        pass
+
+    @abstractmethod
+    def uptime(self) -> UptimeInfo:
+        """
+        Get the system uptime, the equivalent of ``uptime``
+
+        Returns:
+            UptimeInfo object
+        """
+        pass
+
+    @abstractmethod
+    def memory(self) -> MemoryInfo:
+        """
+        Get the memory usage, the equivalent of ``free``
+
+        Returns:
+            MemoryInfo object
+        """
+        pass
+
+    @abstractmethod
+    def cpu_count(self) -> int:
+        """
+        Get the number of usable CPUs, the equivalent of ``nproc``
+
+        Returns:
+            Number of CPUs available to the process
+        """
+        pass
+
+    @abstractmethod
+    def disk_usage(self, path: str = "/") -> DiskUsage:
+        """
+        Get the usage of the filesystem containing the path
+
+        Args:
+            path: any path on the filesystem
+
+        Returns:
+            DiskUsage object
+        """
+        pass
+
+    @abstractmethod
+    def disks(self) -> List[DiskUsage]:
+        """
+        Get the usage of all mounted filesystems, the equivalent of ``df``
+
+        Returns:
+            List of DiskUsage objects
+        """
+        pass
+
+    @abstractmethod
+    def processes(self) -> List[ProcessInfo]:
+        """
+        Get the running processes, the equivalent of ``ps -e``
+
+        Returns:
+            List of ProcessInfo objects
+        """
+        pass
+
+    @abstractmethod
+    def snapshot(self) -> SystemSnapshot:
+        """
+        Read uptime, memory, CPU count and disks at once
+
+        Returns:
+            SystemSnapshot object
+        """
+        pass
@@ -0,0 +1,126 @@
+"""
+Interface for state store
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List, Sequence
+
+from app.core.types.enums import CommandStatus
+from app.core.types.models import CommandResult, CommandRecord
+
+
+class IStateStore(ABC):
+    """
+    Interface for persistent command history and state
+    """
+
+    @abstractmethod
+    def record(self,
+               result: CommandResult,
+               metadata: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Queue a command result for persisting
+
+        Never raises, results that cannot be stored are logged and
+        dropped so recording does not break command execution.
+
+        Args:
+            result: result of the command
+            metadata: additional data, values that are not JSON
+                serializable are stored as strings
+        """
+        pass
+
+    @abstractmethod
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until all queued results are written
+
+        Args:
+            timeout: maximum time to wait in seconds
+
+        Returns:
+            True if everything was written
+        """
+        pass
+
+    @abstractmethod
+    def last(self,
+             command: Optional[str] = None,
+             statuses: Optional[Sequence[CommandStatus]] = None,
+             limit: int = 10) -> List[CommandRecord]:
+        """
+        Get the latest records, newest first
+
+        Args:
+            command: filter by command
+            statuses: filter by statuses
+            limit: maximum number of records
+
+        Returns:
+            List of CommandRecord objects
+        """
+        pass
+
+    @abstractmethod
+    def last_failures(self,
+                      command: str,
+                      limit: int = 10) -> List[CommandRecord]:
+        """
+        Get the latest failed or timed out runs of a command
+
+        Args:
+            command: command to look for
+            limit: maximum number of records
+
+        Returns:
+            List of CommandRecord objects, newest first
+        """
+        pass
+
+    @abstractmethod
+    def duration_percentile(self,
+                            percentile: float = 95,
+                            since: Optional[float] = None
+                            ) -> Dict[str, float]:
+        """
+        Get a percentile of execution time per program
+
+        Args:
+            percentile: percentile in range (0, 100]
+            since: only use results created after this unix time
+
+        Returns:
+            Dict mapping program name to execution time in seconds
+        """
+        pass
+
+    @abstractmethod
+    def apply_retention(self,
+                        max_age: Optional[float] = None,
+                        max_rows: Optional[int] = None) -> int:
+        """
+        Delete records beyond the retention limits
+
+        Args:
+            max_age: maximum age of records in seconds
+            max_rows: maximum number of records to keep
+
+        Returns:
+            Number of deleted records
+        """
+        pass
+
+    @abstractmethod
+    def compact(self) -> None:
+        """
+        Return free pages to the filesystem and truncate the WAL
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Flush pending results and close the store
+        """
+        pass
@@ -0,0 +1,257 @@
+"""
+Probe manager reading system state from /proc and os calls
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app.core.interfaces.probe import IProbe
+from app.core.types.models import (DiskUsage, LoadAverage, MemoryInfo,
+                                   ProcessInfo, SystemSnapshot, UptimeInfo)
+
+PROC_ROOT = "/proc"
+
+READ_SIZE = 64 * 1024
+
+# System-wide files read on every probe, their descriptors stay open.
+# Anything else, per-process files in particular, is opened per read.
+CACHED_FILES = ("loadavg", "uptime", "meminfo", "self/mounts")
+
+_OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+# Filesystems without storage, hidden by ``df`` as well
+PSEUDO_FILESYSTEMS = frozenset({
+    "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs",
+    "debugfs", "devpts", "efivarfs", "fusectl", "hugetlbfs", "mqueue",
+    "nsfs", "proc", "pstore", "rpc_pipefs", "securityfs", "selinuxfs",
+    "sysfs", "tracefs",
+})
+
+
+class ProbeManager(IProbe):
+    """
+    Manager for in-process system probes
+
+    Replaces spawning ``uptime``, ``free``, ``df``, ``ps``, ``nproc`` and
+    ``cat /proc/...`` with direct reads. The system-wide files in
+    ``CACHED_FILES`` stay open and are re-read with ``pread`` at offset 0,
+    which makes procfs regenerate their content, so a probe costs one
+    syscall. Other paths are opened and closed on every read, so
+    descriptors of exited processes are never kept.
+    """
+
+    def __init__(self, proc_root: str = PROC_ROOT):
+        """
+        Initialize the probe manager
+
+        Args:
+            proc_root: mount point of procfs
+        """
+        self.proc_root = proc_root
+        self._fds: Dict[str, int] = {}
+        self._cached = frozenset(f"{proc_root}/{name}"
+                                 for name in CACHED_FILES)
+        self._lock = threading.Lock()
+        self._boot_time: Optional[float] = None
+        self._clock_ticks = os.sysconf("SC_CLK_TCK")
+        self._page_size = os.sysconf("SC_PAGE_SIZE")
+
+    def __enter__(self) -> "ProbeManager":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _fd(self, path: str) -> int:
+        fd = self._fds.get(path)
+        if fd is None:
+            with self._lock:
+                fd = self._fds.get(path)
+                if fd is None:
+                    fd = self._fds[path] = os.open(path, os.O_RDONLY)
+        return fd
+
+    @staticmethod
+    def _read_fd(fd: int) -> str:
+        chunks = []
+        offset = 0
+        while True:
+            chunk = os.pread(fd, READ_SIZE, offset)
+            chunks.append(chunk)
+            # procfs fills the buffer, a short read means end of file
+            if len(chunk) < READ_SIZE:
+                break
+            offset += len(chunk)
+        return b"".join(chunks).decode("utf-8", "replace")
+
+    def read(self, path: str) -> str:
+        if path in self._cached:
+            return self._read_fd(self._fd(path))
+        return self._read_once(path)
+
+    @staticmethod
+    def _read_once(path: str) -> str:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            return ProbeManager._read_fd(fd)
+        finally:
+            os.close(fd)
+
+    def _proc(self, name: str) -> str:
+        return self.read(f"{self.proc_root}/{name}")
+
+    def load_average(self) -> LoadAverage:
+        load_1, load_5, load_15, tasks, _ = self._proc("loadavg").split()
+        running, total = tasks.split("/")
+        return LoadAverage(load_1=float(load_1),
+                           load_5=float(load_5),
+                           load_15=float(load_15),
+                           running=int(running),
+                           total=int(total))
+
+    def uptime(self) -> UptimeInfo:
+        uptime, idle = self._proc("uptime").split()
+        return UptimeInfo(uptime=float(uptime),
+                          idle=float(idle),
+                          load=self.load_average())
+
+    def memory(self) -> MemoryInfo:
+        values: Dict[str, int] = {}
+        for line in self._proc("meminfo").splitlines():
+            name, _, value = line.partition(":")
+            parts = value.split()
+            if parts:
+                values[name] = int(parts[0]) * 1024
+
+        total = values.get("MemTotal", 0)
+        free = values.get("MemFree", 0)
+        buffers = values.get("Buffers", 0)
+        cached = values.get("Cached", 0) + values.get("SReclaimable", 0)
+        return MemoryInfo(total=total,
+                          free=free,
+                          available=values.get("MemAvailable", free),
+                          buffers=buffers,
+                          cached=cached,
+                          used=max(total - free - buffers - cached, 0),
+                          swap_total=values.get("SwapTotal", 0),
+                          swap_free=values.get("SwapFree", 0))
+
+    def cpu_count(self) -> int:
+        if hasattr(os, "sched_getaffinity"):
+            return len(os.sched_getaffinity(0))
+        return os.cpu_count() or 1
+
+    def disk_usage(self, path: str = "/") -> DiskUsage:
+        stat = os.statvfs(path)
+        total = stat.f_blocks * stat.f_frsize
+        free = stat.f_bfree * stat.f_frsize
+        return DiskUsage(path=path,
+                         total=total,
+                         used=total - free,
+                         free=free,
+                         available=stat.f_bavail * stat.f_frsize)
+
+    def disks(self) -> List[DiskUsage]:
+        disks = []
+        seen = set()
+        for line in self._proc("self/mounts").splitlines():
+            parts = line.split()
+            if len(parts) < 3:
+                continue
+            device, mount_point, fstype = parts[:3]
+            mount_point = _OCTAL_ESCAPE.sub(
+                lambda match: chr(int(match.group(1), 8)), mount_point)
+            if fstype in PSEUDO_FILESYSTEMS or mount_point in seen:
+                continue
+            try:
+                usage = self.disk_usage(mount_point)
+            except OSError:
+                continue
+            if not usage.total:
+                continue
+            seen.add(mount_point)
+            usage.device = device
+            usage.fstype = fstype
+            disks.append(usage)
+        return disks
+
+    def _read_boot_time(self) -> float:
+        for line in self._read_once(f"{self.proc_root}/stat").splitlines():
+            if line.startswith("btime "):
+                return float(line.split()[1])
+        return time.time() - self.uptime().uptime
+
+    @property
+    def boot_time(self) -> float:
+        if self._boot_time is None:
+            self._boot_time = self._read_boot_time()
+        return self._boot_time
+
+    def _process(self, pid: int) -> ProcessInfo:
+        stat = self._read_once(f"{self.proc_root}/{pid}/stat")
+        # The name may contain spaces and parentheses
+        name_start = stat.index("(")
+        name_end = stat.rindex(")")
+        fields = stat[name_end + 2:].split()
+        return ProcessInfo(
+            pid=pid,
+            ppid=int(fields[1]),
+            name=stat[name_start + 1:name_end],
+            state=fields[0],
+            threads=int(fields[17]),
+            rss=int(fields[21]) * self._page_size,
+            cpu_time=(int(fields[11]) + int(fields[12])) / self._clock_ticks,
+            start_time=self.boot_time + int(fields[19]) / self._clock_ticks)
+
+    def process(self, pid: int) -> Optional[ProcessInfo]:
+        """
+        Get information about one process
+
+        Args:
+            pid: process id
+
+        Returns:
+            ProcessInfo or None if the process does not exist
+        """
+        try:
+            return self._process(pid)
+        except (FileNotFoundError, ProcessLookupError):
+            return None
+
+    def processes(self) -> List[ProcessInfo]:
+        processes = []
+        with os.scandir(self.proc_root) as entries:
+            for entry in entries:
+                if not entry.name.isdigit():
+                    continue
+                info = self.process(int(entry.name))
+                if info is not None:
+                    processes.append(info)
+        return processes
+
+    def snapshot(self) -> SystemSnapshot:
+        return SystemSnapshot(timestamp=time.time(),
+                              uptime=self.uptime(),
+                              memory=self.memory(),
+                              cpu_count=self.cpu_count(),
+                              disks=self.disks())
+
+    def warm(self) -> None:
+        """
+        Open the descriptors of ``CACHED_FILES`` and read the boot time,
+        so the first probe does not pay for it
+        """
+        for path in self._cached:
+            if os.path.exists(path):
+                self._fd(path)
+        if self._boot_time is None:
+            self._boot_time = self._read_boot_time()
+
+    def close(self) -> None:
+        with self._lock:
+            fds, self._fds = self._fds, {}
+        for fd in fds.values():
+            os.close(fd)
@@ -0,0 +1,351 @@
+"""
+State manager persisting command history in SQLite
+"""
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+
+from app.core.interfaces.console import IConsole
+from app.core.interfaces.state import IStateStore
+from app.core.types.enums import CommandStatus
+from app.core.types.models import CommandResult, CommandRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS command_results (
+    id INTEGER PRIMARY KEY,
+    command TEXT NOT NULL,
+    program TEXT NOT NULL,
+    status TEXT NOT NULL,
+    return_code INTEGER NOT NULL,
+    stdout TEXT NOT NULL,
+    stderr TEXT NOT NULL,
+    error TEXT,
+    execution_time REAL NOT NULL,
+    created_at REAL NOT NULL,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_command_results_command
+    ON command_results (command, status, created_at);
+CREATE INDEX IF NOT EXISTS idx_command_results_program
+    ON command_results (program, created_at);
+CREATE INDEX IF NOT EXISTS idx_command_results_status
+    ON command_results (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_command_results_created
+    ON command_results (created_at);
+"""
+
+_INSERT = """
+INSERT INTO command_results (command, program, status, return_code,
+                             stdout, stderr, error, execution_time,
+                             created_at, metadata)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_COLUMNS = ("id, command, program, status, return_code, stdout, stderr, "
+            "error, execution_time, created_at, metadata")
+
+FAILURE_STATUSES = (CommandStatus.FAILED, CommandStatus.TIMEOUT)
+
+DEFAULT_MAX_AGE = 30 * 24 * 3600.0
+DEFAULT_MAX_ROWS = 100000
+
+_STOP = object()
+
+
+class StateManager(IStateStore):
+    """
+    Command history store on SQLite in WAL mode
+
+    Results are queued by ``record`` and written in batches by a
+    background thread, so callers never wait for the disk. Queries use a
+    separate connection and do not block the writer. The writer also
+    applies the retention limits and compacts the file after deleting
+    records, so the database stays bounded.
+    """
+
+    def __init__(self,
+                 path: str,
+                 batch_size: int = 256,
+                 max_output_size: int = 64 * 1024,
+                 max_age: Optional[float] = DEFAULT_MAX_AGE,
+                 max_rows: Optional[int] = DEFAULT_MAX_ROWS,
+                 retention_interval: float = 60.0):
+        """
+        Initialize the state manager
+
+        Args:
+            path: path to the database file
+            batch_size: maximum number of results written in a transaction
+            max_output_size: stdout and stderr are truncated to this size
+            max_age: automatically delete records older than this
+                (seconds), None keeps records of any age
+            max_rows: automatically keep only this many newest records,
+                None keeps any number of records
+            retention_interval: how often the writer applies retention
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.max_output_size = max_output_size
+        self.max_age = max_age
+        self.max_rows = max_rows
+        self.retention_interval = retention_interval
+        self.console: IConsole = None  # Will be set DI Container
+
+        self._write_conn = self._connect()
+        self._write_conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._write_conn.execute("PRAGMA journal_mode = WAL")
+        self._write_conn.executescript(_SCHEMA)
+        self._read_conn = self._connect()
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        # Orders record and flush against close, nothing is queued after
+        # the stop marker
+        self._close_lock = threading.Lock()
+        self._last_retention = time.monotonic()
+        self._closed = False
+
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._writer = threading.Thread(target=self._writer_loop,
+                                        name="state-writer",
+                                        daemon=True)
+        self._writer.start()
+
+    def set_console(self,
+                    console: IConsole) -> None:
+        self.console = console
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path,
+                               isolation_level=None,
+                               check_same_thread=False)
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn
+
+    @staticmethod
+    def _program(command: str) -> str:
+        parts = command.split()
+        if parts and parts[0] == "sudo":
+            parts = parts[1:]
+            if len(parts) >= 2 and parts[0] == "-u":
+                parts = parts[2:]
+        return parts[0].rsplit("/", 1)[-1] if parts else ""
+
+    def _to_row(self,
+                result: CommandResult,
+                metadata: Optional[Dict[str, Any]],
+                created_at: float) -> Tuple:
+        return (
+            result.command,
+            self._program(result.command),
+            result.status.value,
+            result.return_code,
+            (result.stdout or "")[:self.max_output_size],
+            (result.stderr or "")[:self.max_output_size],
+            result.error,
+            result.execution_time,
+            created_at,
+            json.dumps(metadata, default=str) if metadata is not None
+            else None
+        )
+
+    @staticmethod
+    def _to_record(row: Tuple) -> CommandRecord:
+        (record_id, command, program, status, return_code, stdout, stderr,
+         error, execution_time, created_at, metadata) = row
+        return CommandRecord(
+            id=record_id,
+            result=CommandResult(
+                status=CommandStatus(status),
+                return_code=return_code,
+                command=command,
+                stdout=stdout,
+                stderr=stderr,
+                execution_time=execution_time,
+                error=error
+            ),
+            program=program,
+            created_at=created_at,
+            metadata=json.loads(metadata) if metadata is not None else None
+        )
+
+    def _write_batch(self, rows: List[Tuple]) -> None:
+        if not rows:
+            return
+        try:
+            with self._write_lock:
+                self._write_conn.execute("BEGIN")
+                try:
+                    self._write_conn.executemany(_INSERT, rows)
+                    self._write_conn.execute("COMMIT")
+                except Exception:
+                    self._write_conn.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            if self.console:
+                self.console.error(
+                    f"Failed to write {len(rows)} command results: {e}")
+
+    def _writer_loop(self) -> None:
+        while True:
+            items = [self._queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = []
+            stop = False
+            for item in items:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    # Flush marker: everything queued before it is written
+                    self._write_batch(rows)
+                    rows = []
+                    item.set()
+                else:
+                    rows.append(item)
+            self._write_batch(rows)
+
+            if ((self.max_age is not None or self.max_rows is not None) and
+                    time.monotonic() - self._last_retention >=
+                    self.retention_interval):
+                self._last_retention = time.monotonic()
+                try:
+                    # Deleted rows only free pages inside the file
+                    if self.apply_retention(self.max_age, self.max_rows):
+                        self.compact()
+                except sqlite3.Error as e:
+                    if self.console:
+                        self.console.error(f"Failed to apply retention: {e}")
+
+            if stop:
+                return
+
+    def record(self,
+               result: CommandResult,
+               metadata: Optional[Dict[str, Any]] = None) -> None:
+        try:
+            row = self._to_row(result, metadata, time.time())
+        except Exception as e:
+            if self.console:
+                self.console.error(
+                    f"Failed to record result of {result.command}: {e}")
+            return
+        with self._close_lock:
+            if not self._closed:
+                self._queue.put(row)
+                return
+        if self.console:
+            self.console.warning(
+                f"State store is closed, dropped result of "
+                f"{result.command}")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        marker = threading.Event()
+        with self._close_lock:
+            if self._closed:
+                return True
+            self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def _query(self,
+               sql: str,
+               params: Sequence[Any] = ()) -> List[Tuple]:
+        with self._read_lock:
+            return self._read_conn.execute(sql, params).fetchall()
+
+    def last(self,
+             command: Optional[str] = None,
+             statuses: Optional[Sequence[CommandStatus]] = None,
+             limit: int = 10) -> List[CommandRecord]:
+        conditions = []
+        params: List[Any] = []
+        if command is not None:
+            conditions.append("command = ?")
+            params.append(command)
+        if statuses:
+            conditions.append(
+                f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(status.value for status in statuses)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.append(limit)
+
+        rows = self._query(
+            f"SELECT {_COLUMNS} FROM command_results {where} "
+            f"ORDER BY created_at DESC, id DESC LIMIT ?", params)
+        return [self._to_record(row) for row in rows]
+
+    def last_failures(self,
+                      command: str,
+                      limit: int = 10) -> List[CommandRecord]:
+        return self.last(command, FAILURE_STATUSES, limit)
+
+    def duration_percentile(self,
+                            percentile: float = 95,
+                            since: Optional[float] = None
+                            ) -> Dict[str, float]:
+        if not 0 < percentile <= 100:
+            raise ValueError(
+                f"Percentile must be in range (0, 100], got {percentile}")
+        fraction = percentile / 100
+        # Nearest-rank method: rank = ceil(fraction * count)
+        rows = self._query(
+            """
+            SELECT program, execution_time FROM (
+                SELECT program, execution_time,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY program
+                           ORDER BY execution_time) AS rn,
+                       COUNT(*) OVER (PARTITION BY program) AS cnt
+                FROM command_results
+                WHERE created_at >= ?
+            )
+            WHERE rn = MAX(1, CAST(? * cnt AS INTEGER) +
+                              (? * cnt > CAST(? * cnt AS INTEGER)))
+            """,
+            (since if since is not None else 0,
+             fraction, fraction, fraction))
+        return dict(rows)
+
+    def apply_retention(self,
+                        max_age: Optional[float] = None,
+                        max_rows: Optional[int] = None) -> int:
+        deleted = 0
+        with self._write_lock:
+            if max_age is not None:
+                deleted += self._write_conn.execute(
+                    "DELETE FROM command_results WHERE created_at < ?",
+                    (time.time() - max_age,)).rowcount
+            if max_rows is not None:
+                deleted += self._write_conn.execute(
+                    "DELETE FROM command_results WHERE id <= ("
+                    "SELECT id FROM command_results "
+                    "ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (max_rows,)).rowcount
+        return deleted
+
+    def compact(self) -> None:
+        with self._write_lock:
+            # incremental_vacuum frees one page per step, so drain it
+            self._write_conn.execute("PRAGMA incremental_vacuum").fetchall()
+            self._write_conn.execute(
+                "PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+    def close(self) -> None:
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._writer.join()
+        with self._read_lock:
+            self._read_conn.close()
+        with self._write_lock:
+            self._write_conn.close()
@@ -0,0 +1,245 @@
+"""
+Trace manager recording hot-path spans
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, IO, List, Optional, Union
+
+_current_span: "ContextVar[Optional[Span]]" = ContextVar(
+    "current_span", default=None)
+
+
+class _NoopSpan:
+    """
+    Span returned while tracing is disabled or the trace is not sampled
+    """
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _UnsampledSpan(_NoopSpan):
+    """
+    Root span of a trace dropped by sampling, its children are dropped too
+    """
+    __slots__ = ("_token",)
+
+    def __enter__(self) -> "_UnsampledSpan":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        _current_span.reset(self._token)
+
+
+class Span:
+    """
+    Timed region of code with attributes
+    """
+    __slots__ = ("tracer", "name", "category", "attributes", "start_ns",
+                 "end_ns", "thread_id", "task", "parent", "_token")
+
+    def __init__(self,
+                 tracer: "TraceManager",
+                 name: str,
+                 category: str,
+                 attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.start_ns = 0
+        self.end_ns = 0
+        self.thread_id = 0
+        self.task: Optional[str] = None
+        self.parent: Optional[Span] = None
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.parent = _current_span.get()
+        self.thread_id = threading.get_ident()
+        self.task = _current_task_name()
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+        self.tracer._finish(self)
+
+    @property
+    def duration(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+def _current_task_name() -> Optional[str]:
+    # Never import asyncio here, only look at it when the app uses it
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is None:
+        return None
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        return None
+    if task is None:
+        return None
+    get_name = getattr(task, "get_name", None)
+    return get_name() if get_name else str(id(task))
+
+
+class TraceManager:
+    """
+    Manager for low-overhead tracing spans
+
+    While disabled, ``span`` returns a shared no-op object, so
+    instrumented code only pays for one attribute check and a call.
+    Sampling is decided once per root span; children of a dropped root
+    are dropped as well. Finished spans are kept in a bounded buffer and
+    exported in the Chrome trace-event format (chrome://tracing, Perfetto).
+    """
+
+    def __init__(self,
+                 enabled: bool = False,
+                 sample_rate: float = 1.0,
+                 max_spans: int = 100000):
+        """
+        Initialize the trace manager
+
+        Args:
+            enabled: whether spans are recorded
+            sample_rate: fraction of root spans recorded, 0.0 to 1.0
+            max_spans: number of finished spans kept, oldest are dropped
+        """
+        self.enabled = False
+        self.sample_rate = 1.0
+        self._random: Any = None
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._thread_names: Dict[int, str] = {}
+        self.configure(enabled, sample_rate)
+
+    def configure(self,
+                  enabled: bool = True,
+                  sample_rate: Optional[float] = None) -> None:
+        """
+        Enable or disable tracing and set the sample rate
+        """
+        if sample_rate is not None:
+            if not 0.0 <= sample_rate <= 1.0:
+                raise ValueError(
+                    f"Sample rate must be in range [0, 1], got {sample_rate}")
+            self.sample_rate = sample_rate
+            if sample_rate < 1.0 and self._random is None:
+                import random
+                self._random = random.random
+        self.enabled = enabled
+
+    def span(self,
+             name: str,
+             category: str = "app",
+             **attributes: Any) -> Union[Span, _NoopSpan]:
+        """
+        Create a span to be used as a context manager
+
+        Args:
+            name: name of the span
+            category: category shown in the trace viewer
+            attributes: values attached to the span
+
+        Returns:
+            Span or a no-op span when the span is not recorded
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = _current_span.get()
+        if parent is None:
+            if (self.sample_rate < 1.0 and
+                    self._random() >= self.sample_rate):
+                return _UnsampledSpan()
+        elif isinstance(parent, _UnsampledSpan):
+            return NOOP_SPAN
+        return Span(self, name, category, attributes)
+
+    def _finish(self, span: Span) -> None:
+        if span.thread_id not in self._thread_names:
+            self._thread_names[span.thread_id] = \
+                threading.current_thread().name
+        self._spans.append(span)
+
+    @property
+    def spans(self) -> List[Span]:
+        return list(self._spans)
+
+    def clear(self) -> None:
+        self._spans.clear()
+        self._thread_names.clear()
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Convert recorded spans to the Chrome trace-event format
+
+        Returns:
+            Dict ready to be serialized as JSON
+        """
+        pid = os.getpid()
+        events: List[Dict[str, Any]] = [
+            {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid,
+             "args": {"name": name}}
+            for tid, name in list(self._thread_names.items())
+        ]
+        for span in list(self._spans):
+            args = {key: value if isinstance(value, (str, int, float, bool))
+                    or value is None else str(value)
+                    for key, value in span.attributes.items()}
+            if span.task is not None:
+                args["task"] = span.task
+            events.append({
+                "ph": "X",
+                "name": span.name,
+                "cat": span.category,
+                "ts": span.start_ns / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, target: Union[str, IO[str]]) -> None:
+        """
+        Write recorded spans as Chrome trace-event JSON
+
+        Args:
+            target: file path or text file object
+        """
+        import json
+
+        trace = self.to_chrome_trace()
+        if isinstance(target, str):
+            with open(target, "w", encoding="utf-8") as f:
+                json.dump(trace, f)
+        else:
+            json.dump(trace, target)
+
+
+# Process-wide tracer used by the core components, disabled by default
+tracer = TraceManager()
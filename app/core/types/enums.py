@@ -38,3 +38,17 @@ class CommandStatus(Enum):
     PENDING: str = "pending"
     INTERRUPTED: str = "interrupted"
     TIMEOUT: str = "timeout"
+
+
+"""
+ENUMS FOR DI CONTAINER
+"""
+
+
+class ServiceLifetime(Enum):
+    """
+    Enum for service lifetimes in the DI container
+    """
+    SINGLETON: str = "singleton"
+    SCOPED: str = "scoped"
+    TRANSIENT: str = "transient"
@@ -2,8 +2,10 @@
 Models for the core types
 """
 
+import os
 from dataclasses import dataclass
-from typing import Optional
+from typing import (Optional, Union, Iterable, AsyncIterable, IO, Dict,
+                    Any, Callable, List)
 
 from app.core.types.enums import CommandStatus
 
@@ -25,3 +27,218 @@ class CommandResult:
     stderr: str
     execution_time: float
     error: Optional[str] = None
+
+
+@dataclass
+class CommandRecord:
+    """
+    Command result persisted in the state store
+    """
+    id: int
+    result: CommandResult
+    program: str
+    created_at: float
+    metadata: Optional[Dict[str, Any]] = None
+
+
+StdinChunk = Union[bytes, bytearray, memoryview, str]
+StdinSource = Union[StdinChunk, "os.PathLike[str]", int, IO[bytes],
+                    Iterable[StdinChunk], AsyncIterable[StdinChunk]]
+
+# Called with the stream name ("stdout" or "stderr") and a line of output
+OutputCallback = Callable[[str, str], None]
+
+
+"""
+MODELS FOR DI CONTAINER
+"""
+
+
+@dataclass
+class ServiceStats:
+    """
+    Resolution statistics of a service in the DI container
+    """
+    resolutions: int = 0
+    total_time: float = 0.0
+    min_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def avg_time(self) -> float:
+        if not self.resolutions:
+            return 0.0
+        return self.total_time / self.resolutions
+
+    def record(self, elapsed: float) -> None:
+        if not self.resolutions or elapsed < self.min_time:
+            self.min_time = elapsed
+        if elapsed > self.max_time:
+            self.max_time = elapsed
+        self.resolutions += 1
+        self.total_time += elapsed
+
+
+"""
+MODELS FOR REMOTE EXECUTION
+"""
+
+
+@dataclass
+class AgentStatus:
+    """
+    Health and load of a worker agent
+    """
+    address: str
+    healthy: bool
+    inflight: int
+    load: int
+    capacity: int
+    latency: Optional[float] = None
+    completed: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+
+
+"""
+MODELS FOR SYSTEM PROBES
+"""
+
+
+@dataclass
+class LoadAverage:
+    """
+    System load average from /proc/loadavg
+    """
+    load_1: float
+    load_5: float
+    load_15: float
+    running: int
+    total: int
+
+
+@dataclass
+class UptimeInfo:
+    """
+    System uptime from /proc/uptime
+    """
+    uptime: float
+    idle: float
+    load: LoadAverage
+
+
+@dataclass
+class MemoryInfo:
+    """
+    Memory usage in bytes from /proc/meminfo, as reported by ``free``
+    """
+    total: int
+    free: int
+    available: int
+    buffers: int
+    cached: int
+    used: int
+    swap_total: int
+    swap_free: int
+
+    @property
+    def swap_used(self) -> int:
+        return self.swap_total - self.swap_free
+
+
+@dataclass
+class DiskUsage:
+    """
+    Filesystem usage in bytes, as reported by ``df``
+    """
+    path: str
+    total: int
+    used: int
+    free: int
+    available: int
+    device: Optional[str] = None
+    fstype: Optional[str] = None
+
+    @property
+    def percent(self) -> float:
+        capacity = self.used + self.available
+        return 100.0 * self.used / capacity if capacity else 0.0
+
+
+@dataclass
+class ProcessInfo:
+    """
+    Process information from /proc/<pid>/stat, as reported by ``ps``
+    """
+    pid: int
+    ppid: int
+    name: str
+    state: str
+    threads: int
+    rss: int
+    cpu_time: float
+    start_time: float
+
+
+@dataclass
+class SystemSnapshot:
+    """
+    Batch of system probes read at once
+    """
+    timestamp: float
+    uptime: UptimeInfo
+    memory: MemoryInfo
+    cpu_count: int
+    disks: List[DiskUsage]
+
+
+"""
+MODELS FOR BOOTSTRAP
+"""
+
+
+@dataclass
+class InitializerTiming:
+    """
+    Timing of one initializer during startup and shutdown
+
+    ``start`` is the offset from the beginning of the bootstrap.
+    """
+    name: str
+    depends_on: List[str]
+    start: float = 0.0
+    duration: float = 0.0
+    thread: str = ""
+    shutdown_time: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BootstrapReport:
+    """
+    Timing report of the application bootstrap
+    """
+    total_time: float
+    timings: List[InitializerTiming]
+    critical_path: List[str]
+
+    def format(self) -> str:
+        """
+        Render the report as a table ordered by start time
+
+        Initializers on the critical path, the chain of dependencies that
+        determines the total startup time, are marked with ``*``.
+        """
+        lines = [f"{'initializer':<24} {'start ms':>10} {'duration ms':>12} "
+                 f"{'shutdown ms':>12}  thread"]
+        for timing in sorted(self.timings, key=lambda t: t.start):
+            marker = "*" if timing.name in self.critical_path else " "
+            shutdown = (f"{timing.shutdown_time * 1e3:.1f}"
+                        if timing.shutdown_time is not None else "-")
+            lines.append(f"{marker}{timing.name:<23} "
+                         f"{timing.start * 1e3:>10.1f} "
+                         f"{timing.duration * 1e3:>12.1f} "
+                         f"{shutdown:>12}  {timing.thread}")
+        lines.append(f"total {self.total_time * 1e3:.1f} ms, critical path: "
+                     f"{' -> '.join(self.critical_path)}")
+        return "\n".join(lines)
@@ -0,0 +1,3 @@
+"""
+Remote command execution package
+"""
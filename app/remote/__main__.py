@@ -0,0 +1,46 @@
+"""
+Run a worker agent: python -m app.remote --listen 127.0.0.1:7100
+
+Clients authenticate with the AGENT_TOKEN setting shared with the agent.
+"""
+
+import argparse
+import asyncio
+
+from app.core.command_manager import CommandManager
+from app.core.config import Settings, check_token
+from app.core.console_manager import ConsoleManager
+from app.core.exceptions import ConfigError
+from app.remote.agent import WorkerAgent
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Worker agent")
+    parser.add_argument("--listen", default="127.0.0.1:7100",
+                        help="host:port or unix:/path")
+    parser.add_argument("--max-concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    settings = Settings.from_env(env_file=".env")
+    try:
+        token = check_token(settings.agent_token, "AGENT_TOKEN")
+    except ConfigError as e:
+        raise SystemExit(f"Cannot start the agent: {e}")
+    console = ConsoleManager(settings.app_name, settings.debug)
+    command = CommandManager()
+    command.set_console(console)
+
+    agent = WorkerAgent(command, args.listen, token,
+                        args.max_concurrency)
+    agent.set_console(console)
+    try:
+        await agent.serve_forever()
+    finally:
+        await agent.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
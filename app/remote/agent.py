@@ -0,0 +1,280 @@
+"""
+Worker agent executing commands for remote command managers
+"""
+
+import asyncio
+import base64
+import hmac
+import os
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Optional, Set
+
+from app.core.interfaces.command import ICommand
+from app.core.interfaces.console import IConsole
+from app.core.types.enums import CommandStatus
+from app.core.types.models import CommandResult
+from app.remote.protocol import (encode_frame, parse_address, read_frame,
+                                 result_to_dict, sign_challenge)
+
+_CLOSE = object()
+
+
+class WorkerAgent:
+    """
+    Agent listening on a TCP or Unix socket and running commands
+
+    Each connection is multiplexed: requests are executed concurrently on
+    a shared pool of ``max_concurrency`` threads and responses are written
+    by a single writer task per connection as they become available.
+    Clients must prove they know the shared token before any request is
+    read, see ``app.remote.protocol``.
+    """
+
+    def __init__(self,
+                 command: ICommand,
+                 address: str,
+                 token: str,
+                 max_concurrency: int = 16,
+                 handshake_timeout: float = 10.0):
+        """
+        Initialize the worker agent
+
+        Args:
+            command: command manager running the commands locally
+            address: ``host:port`` or ``unix:/path`` to listen on
+            token: shared secret clients authenticate with
+            max_concurrency: number of commands running at the same time
+            handshake_timeout: time a client has to authenticate
+        """
+        if not token:
+            raise ValueError("Agent token must not be empty")
+        self.command = command
+        self.address = address
+        self.token = token
+        self.max_concurrency = max_concurrency
+        self.handshake_timeout = handshake_timeout
+        self.console: IConsole = None  # Will be set DI Container
+        self.active = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency,
+                                            thread_name_prefix="agent")
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+
+    def set_console(self,
+                    console: IConsole) -> None:
+        self.console = console
+
+    async def start(self) -> None:
+        target = parse_address(self.address)
+        if isinstance(target, str):
+            if os.path.exists(target):
+                os.unlink(target)
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, target)
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_connection, *target)
+            host, port = self._server.sockets[0].getsockname()[:2]
+            self.address = f"{host}:{port}"
+        if self.console:
+            self.console.info(f"Agent listening on {self.address}", "agent")
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._executor.shutdown(wait=False)
+
+    async def _write_loop(self,
+                          writer: asyncio.StreamWriter,
+                          outgoing: "asyncio.Queue[Any]") -> None:
+        while True:
+            message = await outgoing.get()
+            if message is _CLOSE:
+                return
+            writer.write(encode_frame(message))
+            if outgoing.empty():
+                await writer.drain()
+
+    async def _authenticate(self,
+                            reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter) -> bool:
+        nonce = secrets.token_hex(16)
+        writer.write(encode_frame({"type": "challenge", "nonce": nonce}))
+        await writer.drain()
+        try:
+            message = await asyncio.wait_for(read_frame(reader),
+                                             self.handshake_timeout)
+        except asyncio.TimeoutError:
+            return False
+        digest = message.get("digest")
+        authenticated = (message.get("type") == "auth" and
+                         isinstance(digest, str) and
+                         hmac.compare_digest(
+                             digest, sign_challenge(self.token, nonce)))
+        writer.write(encode_frame({"type": "auth", "ok": authenticated}))
+        await writer.drain()
+        return authenticated
+
+    async def _handle_connection(self,
+                                 reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            authenticated = await self._authenticate(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            authenticated = False
+        if not authenticated:
+            if self.console:
+                peer = writer.get_extra_info("peername")
+                self.console.warning(
+                    f"Rejected unauthenticated client {peer or ''}",
+                    "agent")
+            self._connections.discard(writer)
+            writer.close()
+            return
+
+        outgoing: "asyncio.Queue[Any]" = asyncio.Queue()
+        write_task = asyncio.ensure_future(self._write_loop(writer,
+                                                            outgoing))
+        tasks: Set["asyncio.Future[None]"] = set()
+        cancels: Dict[Any, threading.Event] = {}
+        try:
+            while True:
+                message = await read_frame(reader)
+                if message.get("type") == "cancel":
+                    cancel = cancels.get(message.get("id"))
+                    if cancel is not None:
+                        cancel.set()
+                elif message.get("type") == "ping":
+                    outgoing.put_nowait({
+                        "type": "pong",
+                        "id": message.get("id"),
+                        "load": self.active,
+                        "capacity": self.max_concurrency,
+                    })
+                elif message.get("type") == "execute":
+                    cancel = cancels[message.get("id")] = threading.Event()
+                    task = asyncio.ensure_future(
+                        self._execute(message, outgoing, cancel))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    task.add_done_callback(
+                        partial(self._forget, cancels, message.get("id"),
+                                cancel))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError as e:
+            if self.console:
+                self.console.error(f"Invalid frame from client: {e}",
+                                   "agent")
+        finally:
+            for cancel in cancels.values():
+                cancel.set()
+            for task in tasks:
+                task.cancel()
+            outgoing.put_nowait(_CLOSE)
+            try:
+                await write_task
+            except ConnectionError:
+                pass
+            self._connections.discard(writer)
+            writer.close()
+
+    @staticmethod
+    def _forget(cancels: Dict[Any, threading.Event],
+                request_id: Any,
+                cancel: threading.Event,
+                _: Any) -> None:
+        if cancels.get(request_id) is cancel:
+            del cancels[request_id]
+
+    @staticmethod
+    def _not_run(message: Dict[str, Any],
+                 status: CommandStatus,
+                 error: str) -> CommandResult:
+        command = message["command"]
+        if isinstance(command, list):
+            command = " ".join(command)
+        return CommandResult(
+            status=status,
+            return_code=-1,
+            command=str(command),
+            stdout="",
+            stderr="",
+            execution_time=0.0,
+            error=error)
+
+    def _run(self,
+             message: Dict[str, Any],
+             on_output: Any,
+             deadline: Optional[float],
+             cancel: threading.Event) -> CommandResult:
+        # The request may have waited for a free worker
+        if cancel.is_set():
+            return self._not_run(message, CommandStatus.CANCELLED,
+                                 "Request was cancelled before it started")
+        timeout = None
+        if deadline is not None:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                return self._not_run(
+                    message, CommandStatus.TIMEOUT,
+                    "Request timed out waiting for a free worker")
+        stdin = message.get("stdin")
+        return self.command.execute(
+            message["command"],
+            timeout=timeout,
+            env=message.get("env"),
+            cwd=message.get("cwd"),
+            shell=bool(message.get("shell")),
+            stdin=base64.b64decode(stdin) if stdin is not None else None,
+            on_output=on_output)
+
+    async def _execute(self,
+                       message: Dict[str, Any],
+                       outgoing: "asyncio.Queue[Any]",
+                       cancel: threading.Event) -> None:
+        loop = asyncio.get_running_loop()
+        request_id = message.get("id")
+        timeout = message.get("timeout")
+        deadline = (time.monotonic() + timeout if timeout is not None
+                    else None)
+        on_output = None
+        if message.get("stream"):
+            def send_output(stream: str, line: str) -> None:
+                outgoing.put_nowait({"type": "output", "id": request_id,
+                                     "stream": stream, "data": line})
+            on_output = partial(loop.call_soon_threadsafe, send_output)
+
+        self.active += 1
+        try:
+            result = await loop.run_in_executor(
+                self._executor, self._run, message, on_output, deadline,
+                cancel)
+        except Exception as e:
+            result = CommandResult(
+                status=CommandStatus.FAILED,
+                return_code=-1,
+                command=str(message.get("command")),
+                stdout="",
+                stderr=str(e),
+                execution_time=0.0,
+                error=str(e))
+        finally:
+            self.active -= 1
+        outgoing.put_nowait({"type": "result", "id": request_id,
+                             "result": result_to_dict(result)})
@@ -0,0 +1,461 @@
+"""
+Remote Command Manager
+"""
+
+import asyncio
+import base64
+import concurrent.futures
+import itertools
+import os
+import threading
+import time
+from functools import partial
+from typing import (Any, Callable, Dict, Iterator, List, Optional,
+                    Sequence, Tuple, Union)
+
+from app.core.command_base import BaseCommandManager
+from app.core.command_manager import STDIN_CHUNK_SIZE
+from app.core.types.enums import CommandStatus
+from app.core.types.models import (AgentStatus, CommandResult,
+                                   OutputCallback, StdinChunk, StdinSource)
+from app.remote.protocol import (MAX_FRAME_SIZE, encode_frame,
+                                 open_connection, read_frame,
+                                 result_from_dict, sign_challenge)
+
+# Base64 grows the input by a third, leave room for the rest of the frame
+MAX_STDIN_SIZE = MAX_FRAME_SIZE * 3 // 4 - 64 * 1024
+
+# Extra time for the network and the agent queue on top of the timeout
+TIMEOUT_MARGIN = 1.0
+
+
+class _AgentConnection:
+    """
+    Persistent multiplexed connection to one worker agent
+
+    Lives on the event loop of the remote command manager.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        self.healthy = False
+        self.inflight = 0
+        self.load = 0
+        self.capacity = 1
+        self.latency: Optional[float] = None
+        self.completed = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._check_lock: Optional[asyncio.Lock] = None
+        self._read_task: Optional["asyncio.Task[None]"] = None
+        self._pending: Dict[int, Tuple["asyncio.Future[Dict[str, Any]]",
+                                       Optional[OutputCallback]]] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    @property
+    def score(self) -> float:
+        return max(self.inflight, self.load) / max(self.capacity, 1)
+
+    @property
+    def check_lock(self) -> asyncio.Lock:
+        if self._check_lock is None:
+            self._check_lock = asyncio.Lock()
+        return self._check_lock
+
+    async def _handshake(self,
+                         token: str) -> Tuple[asyncio.StreamReader,
+                                              asyncio.StreamWriter]:
+        reader, writer = await open_connection(self.address)
+        try:
+            challenge = await read_frame(reader)
+            if challenge.get("type") != "challenge":
+                raise ConnectionError("Agent did not send a challenge")
+            writer.write(encode_frame({
+                "type": "auth",
+                "digest": sign_challenge(token, str(challenge["nonce"])),
+            }))
+            await writer.drain()
+            reply = await read_frame(reader)
+            if reply.get("type") != "auth" or not reply.get("ok"):
+                raise ConnectionError("Agent rejected the token")
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    async def connect(self, token: str, timeout: float) -> None:
+        reader, writer = await asyncio.wait_for(self._handshake(token),
+                                                timeout)
+        self._writer = writer
+        self._write_lock = asyncio.Lock()
+        self._read_task = asyncio.ensure_future(
+            self._read_loop(reader, writer))
+
+    def close(self, error: str = "Agent connection closed") -> None:
+        self.healthy = False
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+        pending, self._pending = self._pending, {}
+        for future, _ in pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(error))
+
+    async def _read_loop(self,
+                         reader: asyncio.StreamReader,
+                         writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                message = await read_frame(reader)
+                entry = self._pending.get(message.get("id"))
+                if entry is None:
+                    continue
+                future, on_output = entry
+                if message.get("type") == "output":
+                    if on_output is not None:
+                        try:
+                            on_output(message["stream"], message["data"])
+                        except Exception:
+                            pass
+                else:
+                    del self._pending[message["id"]]
+                    if not future.done():
+                        future.set_result(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if writer is not self._writer:
+                return
+            self.failures += 1
+            self.last_error = str(e) or type(e).__name__
+            self._read_task = None
+            self.close(f"Agent {self.address} disconnected: "
+                       f"{self.last_error}")
+
+    async def request(self,
+                      message: Dict[str, Any],
+                      on_output: Optional[OutputCallback] = None
+                      ) -> Dict[str, Any]:
+        if self._writer is None:
+            raise ConnectionError(f"Agent {self.address} is not connected")
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = (future, on_output)
+        writer = None
+        try:
+            async with self._write_lock:
+                self._writer.write(encode_frame({**message,
+                                                 "id": request_id}))
+                writer = self._writer
+                await self._writer.drain()
+            return await future
+        finally:
+            # Drop the request when the caller gave up waiting for it and
+            # tell the agent not to start it
+            self._pending.pop(request_id, None)
+            if (not future.done() and writer is not None and
+                    writer is self._writer):
+                writer.write(encode_frame({"type": "cancel",
+                                           "id": request_id}))
+
+    async def ping(self, timeout: float) -> None:
+        start_time = time.perf_counter()
+        reply = await asyncio.wait_for(self.request({"type": "ping"}),
+                                       timeout)
+        self.latency = time.perf_counter() - start_time
+        self.load = int(reply.get("load", 0))
+        self.capacity = int(reply.get("capacity", 1))
+        self.healthy = True
+
+    def status(self) -> AgentStatus:
+        return AgentStatus(address=self.address,
+                           healthy=self.healthy,
+                           inflight=self.inflight,
+                           load=self.load,
+                           capacity=self.capacity,
+                           latency=self.latency,
+                           completed=self.completed,
+                           failures=self.failures,
+                           last_error=self.last_error)
+
+
+class RemoteCommandManager(BaseCommandManager):
+    """
+    Manager executing commands on a pool of worker agents
+
+    Keeps one persistent connection per agent on a private event loop
+    thread. Each command goes to the healthy agent with the lowest load
+    relative to its capacity; agents are pinged periodically and
+    reconnected when they come back.
+    """
+
+    def __init__(self,
+                 agents: Sequence[str],
+                 token: str,
+                 use_sudo: bool = False,
+                 sudo_user: Optional[str] = None,
+                 health_interval: float = 5.0,
+                 connect_timeout: float = 5.0):
+        """
+        Initialize the remote command manager
+
+        Args:
+            agents: agent addresses, ``host:port`` or ``unix:/path``
+            token: shared secret the agents authenticate clients with
+            use_sudo: whether execute commands with sudo
+            sudo_user: user to run the command as
+            health_interval: seconds between agent health checks
+            connect_timeout: timeout for connecting and pinging an agent
+        """
+        if not agents:
+            raise ValueError("At least one agent address is required")
+        if not token:
+            raise ValueError("Agent token must not be empty")
+        super().__init__(use_sudo, sudo_user)
+        self.token = token
+        self.health_interval = health_interval
+        self.connect_timeout = connect_timeout
+
+        self._agents = [_AgentConnection(address) for address in agents]
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="remote-commands",
+                                        daemon=True)
+        self._thread.start()
+        self._monitor = asyncio.run_coroutine_threadsafe(
+            self._monitor_agents(), self._loop)
+
+    async def _check(self, agent: _AgentConnection) -> None:
+        async with agent.check_lock:
+            await self._check_locked(agent)
+
+    async def _check_locked(self, agent: _AgentConnection) -> None:
+        try:
+            if not agent.connected:
+                await agent.connect(self.token, self.connect_timeout)
+            await agent.ping(self.connect_timeout)
+        except Exception as e:
+            was_healthy = agent.healthy
+            agent.failures += 1
+            agent.last_error = str(e) or type(e).__name__
+            agent.close(f"Agent {agent.address} failed health check")
+            if was_healthy and self.console:
+                self.console.warning(
+                    f"Agent {agent.address} is unhealthy: "
+                    f"{agent.last_error}", "remote")
+
+    async def _check_all(self) -> None:
+        await asyncio.gather(*(self._check(agent) for agent in self._agents))
+
+    async def _monitor_agents(self) -> None:
+        while True:
+            await self._check_all()
+            await asyncio.sleep(self.health_interval)
+
+    def _select(self) -> Optional[_AgentConnection]:
+        healthy = [agent for agent in self._agents if agent.healthy]
+        if not healthy:
+            return None
+        return min(healthy, key=lambda agent: agent.score)
+
+    async def _dispatch(self,
+                        message: Dict[str, Any],
+                        on_output: Optional[OutputCallback],
+                        timeout: Optional[float]
+                        ) -> Tuple[str, Dict[str, Any]]:
+        agent = self._select()
+        if agent is None:
+            await self._check_all()
+            agent = self._select()
+        if agent is None:
+            raise ConnectionError("No healthy agents available")
+
+        agent.inflight += 1
+        try:
+            reply = await asyncio.wait_for(agent.request(message, on_output),
+                                           timeout)
+        finally:
+            agent.inflight -= 1
+        agent.completed += 1
+        return agent.address, reply["result"]
+
+    @staticmethod
+    def _read_all(read: Callable[[int], StdinChunk]) -> Iterator[StdinChunk]:
+        while True:
+            chunk = read(STDIN_CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    @classmethod
+    def _stdin_chunks(cls, stdin: StdinSource) -> Iterator[StdinChunk]:
+        if isinstance(stdin, (bytes, bytearray, memoryview, str)):
+            yield stdin
+        elif isinstance(stdin, os.PathLike):
+            with open(stdin, "rb") as f:
+                yield from cls._read_all(f.read)
+        elif isinstance(stdin, int) and not isinstance(stdin, bool):
+            # The descriptor belongs to the caller, it is not closed
+            yield from cls._read_all(partial(os.read, stdin))
+        elif hasattr(stdin, "read"):
+            yield from cls._read_all(stdin.read)
+        elif hasattr(stdin, "__aiter__"):
+            chunks: List[StdinChunk] = []
+
+            async def drain() -> None:
+                async for chunk in stdin:
+                    chunks.append(chunk)
+
+            # A private loop in a helper thread, like the local feeder,
+            # works whether or not the caller runs an event loop
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ex:
+                ex.submit(asyncio.run, drain()).result()
+            yield from chunks
+        elif hasattr(stdin, "__iter__"):
+            yield from stdin
+        else:
+            raise TypeError(f"Unsupported stdin type: {type(stdin)}")
+
+    @classmethod
+    def _encode_stdin(cls, stdin: Optional[StdinSource]) -> Optional[str]:
+        """
+        Read the stdin source locally so it can be sent with the request
+
+        Raises:
+            ValueError: if the input does not fit into one frame
+        """
+        if stdin is None:
+            return None
+        data = bytearray()
+        for chunk in cls._stdin_chunks(stdin):
+            data += chunk.encode() if isinstance(chunk, str) else chunk
+            if len(data) > MAX_STDIN_SIZE:
+                raise ValueError(
+                    f"stdin exceeds {MAX_STDIN_SIZE} bytes, the limit of "
+                    f"remote execution")
+        return base64.b64encode(data).decode()
+
+    def execute(self,
+                command: Union[str, List[str]],
+                timeout: Optional[float] = None,
+                env: Optional[Dict[str, str]] = None,
+                cwd: Optional[str] = None,
+                shell: bool = False,
+                stdin: Optional[StdinSource] = None,
+                on_output: Optional[OutputCallback] = None) -> CommandResult:
+        """
+        Execute the command on an agent
+
+        Accepts every stdin source of ``ICommand.execute``, but the input
+        is not streamed: it is read completely before the request is sent
+        and limited to ``MAX_STDIN_SIZE`` bytes.
+        """
+        start_time = time.time()
+        command_parts = self._build_command(command)
+        address = None
+
+        try:
+            message = {
+                "type": "execute",
+                "command": command_parts,
+                "timeout": timeout,
+                "env": env,
+                "cwd": cwd,
+                "shell": shell,
+                "stdin": self._encode_stdin(stdin),
+                "stream": on_output is not None,
+            }
+            if self.console:
+                self.console.debug(
+                    f"Executing remote command: {' '.join(command_parts)}")
+
+            deadline = None if timeout is None else timeout + TIMEOUT_MARGIN
+            future = asyncio.run_coroutine_threadsafe(
+                self._dispatch(message, on_output, deadline), self._loop)
+            try:
+                # Backstop for time spent before the request is sent
+                address, data = future.result(
+                    None if deadline is None else deadline + TIMEOUT_MARGIN)
+            except concurrent.futures.TimeoutError:
+                future.cancel()
+                raise
+            result = result_from_dict(data)
+            if self.console:
+                self.console.debug(
+                    f"Command {result.command} finished on agent {address} "
+                    f"with status {result.status.value}")
+
+        except (asyncio.TimeoutError, concurrent.futures.TimeoutError):
+            if self.console:
+                self.console.error(
+                    f"Command {' '.join(command_parts)} "
+                    f"timed out after {timeout}s")
+
+            result = CommandResult(
+                status=CommandStatus.TIMEOUT,
+                return_code=-1,
+                stdout="",
+                stderr="",
+                command=" ".join(command_parts),
+                execution_time=time.time() - start_time,
+                error="Command timed out"
+            )
+
+        except Exception as e:
+            execution_time = time.time() - start_time
+
+            if self.console:
+                self.console.error(
+                    f"Command {' '.join(command_parts)} "
+                    f"failed with error: {str(e)}")
+
+            result = CommandResult(
+                status=CommandStatus.FAILED,
+                return_code=-1,
+                stdout="",
+                stderr=str(e),
+                command=" ".join(command_parts),
+                execution_time=execution_time,
+                error=str(e)
+            )
+
+        if self.state:
+            self._record(result, {"cwd": cwd, "sudo": self.use_sudo,
+                                  "agent": address})
+        return result
+
+    def agents_status(self) -> List[AgentStatus]:
+        """
+        Get a snapshot of the health and load of every agent
+        """
+        return [agent.status() for agent in self._agents]
+
+    def check_agents(self) -> List[AgentStatus]:
+        """
+        Run a health check of all agents now and return their status
+        """
+        asyncio.run_coroutine_threadsafe(self._check_all(),
+                                         self._loop).result()
+        return self.agents_status()
+
+    def close(self) -> None:
+        async def shutdown() -> None:
+            self._monitor.cancel()
+            for agent in self._agents:
+                agent.close()
+
+        if self._loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,117 @@
+"""
+Wire protocol between remote command managers and worker agents
+
+Every frame is a 4 byte big-endian length followed by a JSON object.
+Requests carry an ``id`` which is echoed in every response frame, so many
+requests can be in flight on one connection.
+
+Every connection starts with a challenge-response handshake on a shared
+token: the agent sends a random nonce, the client answers with the
+HMAC-SHA256 of the nonce keyed with the token, and the agent closes the
+connection without reading any other frame unless it matches. The token
+itself never goes over the wire; the frames are not encrypted, so use a
+trusted network or a tunnel when commands or output are sensitive.
+
+Handshake:
+    agent:  {"type": "challenge", "nonce"}
+    client: {"type": "auth", "digest"}
+    agent:  {"type": "auth", "ok"}
+
+Client to agent:
+    {"type": "execute", "id", "command", "timeout", "env", "cwd",
+     "shell", "stdin" (base64), "stream"}
+    {"type": "cancel", "id"}
+    {"type": "ping", "id"}
+
+Agent to client:
+    {"type": "output", "id", "stream", "data"}
+    {"type": "result", "id", "result"}
+    {"type": "pong", "id", "load", "capacity"}
+
+The agent counts the ``timeout`` of an execute request from its arrival,
+so time spent queued behind other commands is part of it: a request still
+queued when it expires is answered with a timeout without running, and a
+running command is killed when its time is up. Clients send ``cancel``
+when they stop waiting for a request; the agent then drops it if it has
+not started yet.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import struct
+from dataclasses import asdict
+from typing import Any, Dict, Tuple, Union
+
+from app.core.types.enums import CommandStatus
+from app.core.types.models import CommandResult
+
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+_HEADER = struct.Struct(">I")
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    payload = json.dumps(message, separators=(",", ":")).encode()
+    return _HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    """
+    Read one frame from the stream
+
+    Raises:
+        asyncio.IncompleteReadError: if the connection was closed
+        ValueError: if the frame is too large or not a JSON object
+    """
+    header = await reader.readexactly(_HEADER.size)
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_FRAME_SIZE:
+        raise ValueError(f"Frame of {length} bytes exceeds the limit")
+    message = json.loads(await reader.readexactly(length))
+    if not isinstance(message, dict):
+        raise ValueError("Frame is not a JSON object")
+    return message
+
+
+def sign_challenge(token: str, nonce: str) -> str:
+    """
+    Answer to a handshake challenge, the HMAC-SHA256 of the nonce
+    """
+    return hmac.new(token.encode(), nonce.encode(),
+                    hashlib.sha256).hexdigest()
+
+
+def result_to_dict(result: CommandResult) -> Dict[str, Any]:
+    data = asdict(result)
+    data["status"] = result.status.value
+    return data
+
+
+def result_from_dict(data: Dict[str, Any]) -> CommandResult:
+    return CommandResult(**{**data, "status": CommandStatus(data["status"])})
+
+
+def parse_address(address: str) -> Union[Tuple[str, int], str]:
+    """
+    Parse ``host:port`` or ``unix:/path`` agent addresses
+
+    Returns:
+        Tuple of host and port, or the socket path for unix addresses
+    """
+    if address.startswith("unix:"):
+        return address[len("unix:"):]
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Invalid agent address: {address}")
+    return host.strip("[]") or "127.0.0.1", int(port)
+
+
+async def open_connection(address: str
+                          ) -> Tuple[asyncio.StreamReader,
+                                     asyncio.StreamWriter]:
+    target = parse_address(address)
+    if isinstance(target, str):
+        return await asyncio.open_unix_connection(target)
+    return await asyncio.open_connection(*target)
@@ -0,0 +1,128 @@
+"""
+Local load test of the HTTP job API
+
+Starts the server in-process on a free port and drives it with many
+concurrent keep-alive clients.
+
+Usage:
+    python -m benchmarks.http_load [--clients 1000] [--requests 5]
+                                   [--mode health|job]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import List, Optional, Sequence
+
+from app.api.jobs import JobManager
+from app.api.server import ApiServer
+from app.core.command_manager import CommandManager
+
+TOKEN = "bench"
+
+
+async def _client(port: int,
+                  mode: str,
+                  requests: int,
+                  latencies: List[float],
+                  errors: List[str]) -> None:
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    except OSError as e:
+        errors.append(str(e))
+        return
+
+    if mode == "job":
+        body = json.dumps({"command": "true", "wait": True}).encode()
+        payload = (b"POST /api/v1/jobs HTTP/1.1\r\nHost: bench\r\n"
+                   b"Authorization: Bearer %s\r\n"
+                   b"Content-Length: %d\r\n\r\n%s"
+                   % (TOKEN.encode(), len(body), body))
+    else:
+        payload = b"GET /api/v1/health HTTP/1.1\r\nHost: bench\r\n\r\n"
+
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            writer.write(payload)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1]
+                         .split(b"\r\n")[0])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            status = int(head.split(b" ")[1])
+            if status >= 400:
+                errors.append(f"HTTP {status}")
+    except (OSError, asyncio.IncompleteReadError) as e:
+        errors.append(str(e))
+    finally:
+        writer.close()
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    ordered = sorted(values)
+    index = max(0, int(round(percentile / 100 * len(ordered))) - 1)
+    return ordered[index]
+
+
+async def run(clients: int,
+              requests: int,
+              mode: str,
+              max_concurrency: int) -> dict:
+    """
+    Run the load test
+
+    Returns:
+        Dict with throughput and latency percentiles in milliseconds
+    """
+    jobs = JobManager(CommandManager(),
+                      max_concurrency=max_concurrency,
+                      max_pending=clients)
+    server = ApiServer(jobs, TOKEN, port=0, prefix="/api/v1")
+    await server.start()
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            _client(server.port, mode, requests, latencies, errors)
+            for _ in range(clients)))
+    finally:
+        elapsed = time.perf_counter() - start
+        await server.close()
+
+    return {
+        "mode": mode,
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000 if latencies else 0.0,
+        "p95_ms": _percentile(latencies, 95) * 1000 if latencies else 0.0,
+        "p99_ms": _percentile(latencies, 99) * 1000 if latencies else 0.0,
+        "mean_ms": statistics.mean(latencies) * 1000 if latencies else 0.0,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--mode", choices=("health", "job"),
+                        default="health")
+    parser.add_argument("--max-concurrency", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args.clients, args.requests, args.mode,
+                             args.max_concurrency))
+    print(json.dumps(report, indent=2))
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,187 @@
+"""
+Startup benchmark based on ``python -X importtime``
+
+Usage:
+    python -m benchmarks.import_time [--budget-ms 80] [--runs 5] [--top 15]
+
+Without ``--budget-ms`` the budget is relative to the imports the
+interpreter itself runs at startup (``site``, ``encodings``) in the same
+process, so it scales with the speed of the machine.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+APP_PACKAGE = 'app'
+
+DEFAULT_MODULES = (
+    'app.core',
+    'app.core.console_manager',
+    'app.core.command_manager',
+    'app.core.di_container_manager',
+    'app.core.bootstrap_manager',
+    'app.core.state_manager',
+    'app.core.probe_manager',
+    'app.core.config',
+)
+
+# Modules that must stay out of a cold start of the core package
+HEAVY_MODULES = ('rich', 'subprocess', 'asyncio')
+
+# Absolute budget in milliseconds, replaces the relative one when set
+IMPORT_TIME_BUDGET_MS: Optional[float] = (
+    float(os.environ['APP_IMPORT_BUDGET_MS'])
+    if os.environ.get('APP_IMPORT_BUDGET_MS') else None)
+
+# Allowed import time of the app as a multiple of the interpreter startup
+IMPORT_TIME_BUDGET_RATIO = float(os.environ.get('APP_IMPORT_BUDGET_RATIO',
+                                                20))
+
+
+@dataclass
+class ImportEntry:
+    """
+    One line of ``-X importtime`` output
+    """
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class ImportReport:
+    """
+    Result of an import time measurement
+    """
+    entries: List[ImportEntry]
+    loaded_heavy: List[str]
+
+    @property
+    def total_us(self) -> int:
+        """Cumulative time of the top-level imports of the app package"""
+        return sum(entry.cumulative_us for entry in self.entries
+                   if entry.depth == 0 and
+                   entry.module.split('.')[0] == APP_PACKAGE)
+
+    @property
+    def total_ms(self) -> float:
+        return self.total_us / 1000
+
+    @property
+    def startup_us(self) -> int:
+        """Cumulative time of the imports run by the interpreter startup"""
+        return sum(entry.cumulative_us for entry in self.entries
+                   if entry.depth == 0 and
+                   entry.module.split('.')[0] != APP_PACKAGE)
+
+    def budget_ms(self, budget_ms: Optional[float] = None) -> float:
+        """
+        Get the import time budget of this run
+
+        Args:
+            budget_ms: absolute budget, by default
+                ``IMPORT_TIME_BUDGET_RATIO`` times the interpreter startup
+
+        Returns:
+            Budget in milliseconds
+        """
+        if budget_ms is not None:
+            return budget_ms
+        return self.startup_us * IMPORT_TIME_BUDGET_RATIO / 1000
+
+    def top(self, count: int) -> List[ImportEntry]:
+        return sorted(self.entries, key=lambda entry: entry.self_us,
+                      reverse=True)[:count]
+
+
+def parse_importtime(output: str) -> List[ImportEntry]:
+    """
+    Parse ``-X importtime`` lines from stderr output
+
+    Args:
+        output: stderr of the interpreter
+
+    Returns:
+        List of parsed entries in output order
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        entries.append(ImportEntry(
+            module=stripped,
+            self_us=int(parts[0]),
+            cumulative_us=int(parts[1]),
+            depth=(len(name) - len(stripped) - 1) // 2))
+    return entries
+
+
+def measure(modules: Sequence[str] = DEFAULT_MODULES,
+            runs: int = 5,
+            python: Optional[str] = None) -> ImportReport:
+    """
+    Import the modules in fresh interpreters and keep the fastest run
+
+    Args:
+        modules: modules to import
+        runs: number of cold interpreter starts
+        python: interpreter to use, the current one by default
+
+    Returns:
+        ImportReport of the fastest run
+    """
+    code = (f"import sys; import {', '.join(modules)}; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} "
+            f"if m in sys.modules))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best: Optional[ImportReport] = None
+
+    for _ in range(max(runs, 1)):
+        process = subprocess.run(
+            [python or sys.executable, '-X', 'importtime', '-c', code],
+            capture_output=True, text=True, cwd=root, check=True)
+        report = ImportReport(
+            entries=parse_importtime(process.stderr),
+            loaded_heavy=[m for m in process.stdout.strip().split(',') if m])
+        if best is None or report.total_us < best.total_us:
+            best = report
+    return best
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--budget-ms', type=float,
+                        default=IMPORT_TIME_BUDGET_MS,
+                        help='absolute budget instead of the relative one')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('modules', nargs='*', default=list(DEFAULT_MODULES))
+    args = parser.parse_args(argv)
+
+    report = measure(args.modules, runs=args.runs)
+    print(f"{'self us':>10} {'cumul us':>10}  module")
+    for entry in report.top(args.top):
+        print(f"{entry.self_us:>10} {entry.cumulative_us:>10}  "
+              f"{'  ' * entry.depth}{entry.module}")
+    budget_ms = report.budget_ms(args.budget_ms)
+    print(f"\nTotal: {report.total_ms:.1f}ms (budget {budget_ms:.1f}ms, "
+          f"interpreter startup {report.startup_us / 1000:.1f}ms)")
+    if report.loaded_heavy:
+        print(f"Heavy modules loaded: {', '.join(report.loaded_heavy)}")
+
+    ok = report.total_ms <= budget_ms and not report.loaded_heavy
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Benchmark of in-process probes against spawned system commands
+
+Usage:
+    python -m benchmarks.probes [--runs 50]
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from app.core.command_manager import CommandManager
+from app.core.probe_manager import ProbeManager
+
+
+def _mean_us(func: Callable[[], object], runs: int) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(runs):
+        func()
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+def run(runs: int = 50) -> List[Dict[str, object]]:
+    """
+    Time each probe and its command equivalent
+
+    Returns:
+        List of dicts with mean microseconds per call and speedup
+    """
+    command = CommandManager()
+    cases: List[Tuple[str, Union[str, List[str]],
+                      Callable[[ProbeManager], object]]] = [
+        ("uptime", "uptime", lambda probe: probe.uptime()),
+        ("free", "free -b", lambda probe: probe.memory()),
+        ("df", "df -P /", lambda probe: probe.disk_usage("/")),
+        ("df all", "df -P", lambda probe: probe.disks()),
+        ("ps", "ps -e -o pid,ppid,stat,comm", lambda probe: probe.processes()),
+        ("nproc", "nproc", lambda probe: probe.cpu_count()),
+        ("cat /proc/meminfo", "cat /proc/meminfo",
+         lambda probe: probe.read("/proc/meminfo")),
+        ("snapshot", ["sh", "-c", "uptime; free -b; nproc; df -P"],
+         lambda probe: probe.snapshot()),
+    ]
+
+    results = []
+    with ProbeManager() as probe:
+        for name, spawned, probe_call in cases:
+            spawn_us = _mean_us(lambda: command.execute(spawned), runs)
+            probe_us = _mean_us(lambda: probe_call(probe), runs)
+            results.append({
+                "probe": name,
+                "command": (spawned if isinstance(spawned, str)
+                            else " ".join(spawned)),
+                "spawn_us": round(spawn_us, 1),
+                "probe_us": round(probe_us, 1),
+                "speedup": round(spawn_us / probe_us, 1) if probe_us else 0,
+            })
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run(args.runs)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'probe':<20} {'spawn us':>10} {'probe us':>10} {'speedup':>8}")
+    for row in results:
+        print(f"{row['probe']:<20} {row['spawn_us']:>10} "
+              f"{row['probe_us']:>10} {row['speedup']:>7}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
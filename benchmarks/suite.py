@@ -0,0 +1,339 @@
+"""
+Benchmark suite for core subsystems with regression thresholds
+
+Usage:
+    python -m benchmarks.suite [--quick] [--repeat 3] [--filter command]
+                               [--output results.json]
+                               [--baseline benchmarks/baseline.json]
+                               [--threshold 0.25] [--update-baseline]
+
+Timings depend on the machine, so the baseline is not part of the
+repository: record one locally with ``--update-baseline`` before changing
+the code, then compare against it. Quick and full runs use different
+workloads and are never compared with each other.
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.core.command_manager import CommandManager
+from app.core.console_manager import ConsoleManager
+from app.core.di_container_manager import DIContainerManager
+from app.core.types.enums import ServiceLifetime
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "baseline.json")
+
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass
+class Metric:
+    """
+    Measured value of a benchmark
+    """
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = False
+
+
+@dataclass
+class Regression:
+    """
+    Metric worse than its baseline by more than the threshold
+    """
+    name: str
+    baseline: float
+    current: float
+    change: float
+    threshold: float
+
+
+BENCHMARKS: Dict[str, Callable[[bool], List[Metric]]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """
+    Register a benchmark function taking the ``quick`` flag
+    """
+    def decorator(func: Callable[[bool], List[Metric]]) -> Callable:
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def _time_calls(func: Callable[[], object],
+                iterations: int,
+                rounds: int = 5) -> List[float]:
+    """
+    Return the mean seconds per call of every round
+    """
+    func()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter() - start) / iterations)
+    return samples
+
+
+def _latencies(func: Callable[[], object], count: int) -> List[float]:
+    func()
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - start)
+    return sorted(latencies)
+
+
+def _p95(values: List[float]) -> float:
+    return values[max(0, int(round(0.95 * len(values))) - 1)]
+
+
+@benchmark("command")
+def bench_command(quick: bool) -> List[Metric]:
+    manager = CommandManager()
+    count = 20 if quick else 200
+    latencies = _latencies(lambda: manager.execute("true"), count)
+
+    workers = 8
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda _: manager.execute("true"), range(count)))
+    parallel = count / (time.perf_counter() - start)
+
+    size = 4 * 1024 * 1024 if quick else 32 * 1024 * 1024
+    large = _latencies(
+        lambda: manager.execute(["head", "-c", str(size), "/dev/zero"]),
+        3 if quick else 10)
+    large_median = statistics.median(large)
+
+    return [
+        Metric("command.short.latency_median", statistics.median(latencies)
+               * 1e6, "us"),
+        Metric("command.short.latency_p95", _p95(latencies) * 1e6, "us"),
+        Metric("command.short.throughput", 1 / statistics.mean(latencies),
+               "ops/s", higher_is_better=True),
+        Metric("command.short.parallel_throughput", parallel, "ops/s",
+               higher_is_better=True),
+        Metric("command.large_output.latency_median", large_median * 1e3,
+               "ms"),
+        Metric("command.large_output.throughput",
+               size / large_median / 1024 / 1024, "MiB/s",
+               higher_is_better=True),
+    ]
+
+
+@benchmark("console")
+def bench_console(quick: bool) -> List[Metric]:
+    iterations = 2000 if quick else 20000
+    metrics = []
+    for debug in (False, True):
+        manager = ConsoleManager("Bench", debug=debug)
+        if debug:
+            from rich.console import Console
+            manager.console = Console(file=io.StringIO(), width=120)
+        # Rendering through rich is orders of magnitude slower than the
+        # disabled path, keep the run time of both cases comparable
+        samples = _time_calls(lambda: manager.debug("benchmark message"),
+                              iterations // 100 if debug else iterations)
+        state = "on" if debug else "off"
+        metrics.append(Metric(f"console.debug_{state}.per_call",
+                              min(samples) * 1e9, "ns"))
+        metrics.append(Metric(f"console.debug_{state}.throughput",
+                              1 / min(samples), "msg/s",
+                              higher_is_better=True))
+    return metrics
+
+
+class _Service:
+    pass
+
+
+@benchmark("di")
+def bench_di(quick: bool) -> List[Metric]:
+    iterations = 20000 if quick else 200000
+    container = DIContainerManager()
+    container.clear()
+    metrics = []
+    try:
+        for lifetime in ServiceLifetime:
+            container.register_factory(_Service, _Service, lifetime)
+            if lifetime is ServiceLifetime.SCOPED:
+                with container.create_scope():
+                    samples = _time_calls(lambda: container.get(_Service),
+                                          iterations)
+            else:
+                samples = _time_calls(lambda: container.get(_Service),
+                                      iterations)
+            container.remove(_Service)
+            metrics.append(Metric(f"di.get_{lifetime.value}.per_call",
+                                  min(samples) * 1e9, "ns"))
+    finally:
+        container.clear()
+    return metrics
+
+
+def run(names: Optional[Sequence[str]] = None,
+        quick: bool = False,
+        repeat: int = 1) -> List[Metric]:
+    """
+    Run the selected benchmarks
+
+    Args:
+        names: benchmark names or prefixes, all when empty
+        quick: fewer iterations for smoke runs
+        repeat: run everything this many times and keep the best value
+            of every metric, which filters out noise from other processes
+
+    Returns:
+        List of measured metrics
+    """
+    best: Dict[str, Metric] = {}
+    for _ in range(max(repeat, 1)):
+        for name, func in BENCHMARKS.items():
+            if names and not any(name.startswith(prefix)
+                                 for prefix in names):
+                continue
+            for metric in func(quick):
+                current = best.get(metric.name)
+                if current is None or (
+                        metric.value > current.value
+                        if metric.higher_is_better
+                        else metric.value < current.value):
+                    best[metric.name] = metric
+    return list(best.values())
+
+
+def compare(metrics: Sequence[Metric],
+            baseline: Dict[str, dict],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Regression]:
+    """
+    Compare metrics against the baseline
+
+    A baseline entry may override the threshold with its own
+    ``threshold`` key. Metrics missing from the baseline are skipped.
+
+    Returns:
+        List of regressions beyond the threshold
+    """
+    regressions = []
+    for metric in metrics:
+        entry = baseline.get(metric.name)
+        if not entry or not entry.get("value"):
+            continue
+        base = float(entry["value"])
+        limit = float(entry.get("threshold", threshold))
+        change = (metric.value - base) / base
+        worse = -change if metric.higher_is_better else change
+        if worse > limit:
+            regressions.append(Regression(name=metric.name,
+                                          baseline=base,
+                                          current=metric.value,
+                                          change=change,
+                                          threshold=limit))
+    return regressions
+
+
+def load_results(path: str) -> Dict[str, object]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_baseline(path: str) -> Dict[str, dict]:
+    return load_results(path).get("metrics", {})
+
+
+def to_json(metrics: Sequence[Metric],
+            quick: bool = False) -> Dict[str, object]:
+    return {
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": quick,
+        "metrics": {metric.name: {k: v for k, v in asdict(metric).items()
+                                  if k != "name"}
+                    for metric in metrics},
+    }
+
+
+def save(path: str,
+         metrics: Sequence[Metric],
+         quick: bool = False) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(to_json(metrics, quick), f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", action="append", default=[],
+                        help="run benchmarks with this name prefix")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="keep the best of this many runs")
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float,
+                        default=float(os.environ.get(
+                            "BENCH_THRESHOLD", DEFAULT_THRESHOLD)),
+                        help="allowed relative regression, 0.25 is 25%%")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    metrics = run(args.filter, args.quick, args.repeat)
+    results = load_results(args.baseline)
+    baseline = results.get("metrics", {})
+    note = None
+    if not results:
+        note = (f"No baseline at {args.baseline}, record one with "
+                f"--update-baseline")
+    elif bool(results.get("quick")) != args.quick:
+        baseline = {}
+        note = (f"Baseline at {args.baseline} was recorded "
+                f"{'with' if results.get('quick') else 'without'} --quick, "
+                f"not comparing")
+
+    print(f"{'metric':<40} {'unit':<6} {'value':>12} {'baseline':>12} "
+          f"{'change':>8}")
+    for metric in metrics:
+        base = baseline.get(metric.name, {}).get("value")
+        change = f"{(metric.value - base) / base:+.1%}" if base else ""
+        base_text = f"{base:.1f}" if base is not None else "-"
+        print(f"{metric.name:<40} {metric.unit:<6} {metric.value:>12.1f} "
+              f"{base_text:>12} {change:>8}")
+
+    if args.output:
+        save(args.output, metrics, args.quick)
+    if args.update_baseline:
+        save(args.baseline, metrics, args.quick)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if note:
+        print(f"\n{note}")
+        return 0
+
+    regressions = compare(metrics, baseline, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression.name}: {regression.baseline:.1f} -> "
+              f"{regression.current:.1f} ({regression.change:+.1%}, "
+              f"threshold {regression.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
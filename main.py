@@ -0,0 +1,8 @@
+"""
+Entry point of the application
+"""
+
+from app.api.__main__ import main
+
+if __name__ == "__main__":
+    main()
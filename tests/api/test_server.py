@@ -0,0 +1,278 @@
+"""
+Tests for ApiServer
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.api.jobs import JobManager, JobRequest
+from app.api.server import ApiServer
+from app.core.command_manager import CommandManager
+from app.core.exceptions import JobQueueFullError
+from app.core.types.enums import CommandStatus
+
+
+TOKEN = "test-token"
+
+AUTH = {"Authorization": f"Bearer {TOKEN}"}
+
+
+async def request(port, method, path, body=None, headers=AUTH):
+    """Helper sending one request and reading the whole response"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json.dumps(body).encode() if body is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n"
+    for name, value in (headers or {}).items():
+        head += f"{name}: {value}\r\n"
+    head += f"Content-Length: {len(payload)}\r\n\r\n"
+    writer.write(head.encode() + payload)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    status = int(head.split(b" ")[1])
+    if b"Transfer-Encoding: chunked" in head:
+        body = dechunk(body)
+    return status, head.decode(), body
+
+
+def dechunk(data):
+    """Helper decoding a chunked body"""
+    body = b""
+    while True:
+        size, _, data = data.partition(b"\r\n")
+        size = int(size, 16)
+        if not size:
+            return body
+        body += data[:size]
+        data = data[size + 2:]
+
+
+def run_with_server(scenario, **job_options):
+    """Helper running a scenario against a server on a free port"""
+    async def main():
+        jobs = JobManager(CommandManager(), **job_options)
+        server = ApiServer(jobs, TOKEN, port=0, prefix="/api/v1")
+        await server.start()
+        try:
+            return await scenario(server.port)
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def test_health():
+    """Test health endpoint"""
+    async def scenario(port):
+        return await request(port, "GET", "/api/v1/health")
+
+    status, _, body = run_with_server(scenario)
+    assert status == 200
+    assert json.loads(body)["status"] == "ok"
+
+
+@pytest.mark.parametrize("headers", [
+    None,
+    {"Authorization": "Bearer wrong"},
+    {"Authorization": f"Basic {TOKEN}"},
+])
+def test_unauthorized(headers):
+    """Test routes other than health require the bearer token"""
+    async def scenario(port):
+        submit = await request(port, "POST", "/api/v1/jobs",
+                               {"command": "echo hello"}, headers)
+        status = await request(port, "GET", "/api/v1/jobs/unknown",
+                               headers=headers)
+        health = await request(port, "GET", "/api/v1/health",
+                               headers=headers)
+        return submit, status, health
+
+    submit, status, health = run_with_server(scenario)
+    assert submit[0] == 401
+    assert "WWW-Authenticate: Bearer" in submit[1]
+    assert status[0] == 401
+    assert health[0] == 200
+
+
+def test_empty_token():
+    """Test the server refuses to run without a token"""
+    jobs = JobManager(CommandManager())
+    try:
+        with pytest.raises(ValueError):
+            ApiServer(jobs, "")
+    finally:
+        jobs.close()
+
+
+def test_submit_and_wait():
+    """Test synchronous job submission"""
+    async def scenario(port):
+        return await request(port, "POST", "/api/v1/jobs",
+                             {"command": "echo hello", "wait": True})
+
+    status, _, body = run_with_server(scenario)
+    job = json.loads(body)
+    assert status == 200
+    assert job["status"] == "success"
+    assert job["result"]["stdout"] == "hello\n"
+
+
+def test_submit_async_and_poll():
+    """Test asynchronous submission and long-polling"""
+    async def scenario(port):
+        status, _, body = await request(
+            port, "POST", "/api/v1/jobs",
+            {"command": ["sh", "-c", "sleep 0.1; cat"], "stdin": "data"})
+        assert status == 202
+        job_id = json.loads(body)["id"]
+        return await request(port, "GET", f"/api/v1/jobs/{job_id}?wait=5")
+
+    status, _, body = run_with_server(scenario)
+    job = json.loads(body)
+    assert status == 200
+    assert job["status"] == "success"
+    assert job["result"]["stdout"] == "data"
+
+
+def test_stream_output():
+    """Test chunked output streaming"""
+    async def scenario(port):
+        _, _, body = await request(
+            port, "POST", "/api/v1/jobs",
+            {"command": ["sh", "-c", "echo one; sleep 0.1; echo two"]})
+        job_id = json.loads(body)["id"]
+        return await request(port, "GET", f"/api/v1/jobs/{job_id}/output")
+
+    status, head, body = run_with_server(scenario)
+    assert status == 200
+    assert "Transfer-Encoding: chunked" in head
+    assert body == b"one\ntwo\n"
+
+
+def test_stream_events():
+    """Test server-sent events streaming"""
+    async def scenario(port):
+        _, _, body = await request(port, "POST", "/api/v1/jobs",
+                                   {"command": "echo one"})
+        job_id = json.loads(body)["id"]
+        return await request(port, "GET", f"/api/v1/jobs/{job_id}/events")
+
+    status, head, body = run_with_server(scenario)
+    assert "text/event-stream" in head
+    events = body.decode().split("\n\n")
+    assert events[0] == 'event: stdout\ndata: "one\\n"'
+    assert events[1].startswith("event: done\n")
+
+
+def test_keep_alive():
+    """Test several requests on one connection"""
+    async def scenario(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        statuses = []
+        for _ in range(3):
+            writer.write(b"GET /api/v1/health HTTP/1.1\r\nHost: t\r\n\r\n")
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.split(b"Content-Length: ")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            statuses.append(int(head.split(b" ")[1]))
+        writer.close()
+        return statuses
+
+    assert run_with_server(scenario) == [200, 200, 200]
+
+
+@pytest.mark.parametrize("method, path, body, expected", [
+    ("GET", "/api/v1/jobs/unknown", None, 404),
+    ("GET", "/other", None, 404),
+    ("DELETE", "/api/v1/jobs/unknown", None, 405),
+    ("POST", "/api/v1/jobs", {"command": ""}, 400),
+    ("POST", "/api/v1/jobs", {"command": "ls", "timeout": -1}, 400),
+])
+def test_errors(method, path, body, expected):
+    """Test error responses"""
+    async def scenario(port):
+        return await request(port, method, path, body)
+
+    status, _, body = run_with_server(scenario)
+    assert status == expected
+    assert "error" in json.loads(body)
+
+
+def test_invalid_json():
+    """Test malformed JSON body"""
+    async def scenario(port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /api/v1/jobs HTTP/1.1\r\nContent-Length: 3\r\n"
+                     b"Authorization: Bearer " + TOKEN.encode() +
+                     b"\r\nConnection: close\r\n\r\n{x}")
+        response = await reader.read()
+        writer.close()
+        return response
+
+    assert run_with_server(scenario).startswith(b"HTTP/1.1 400")
+
+
+def test_concurrency_limit():
+    """Test jobs beyond the queue limit are rejected"""
+    async def scenario(port):
+        statuses = []
+        for _ in range(3):
+            status, _, _ = await request(port, "POST", "/api/v1/jobs",
+                                         {"command": "sleep 0.5"})
+            statuses.append(status)
+        return statuses
+
+    statuses = run_with_server(scenario, max_concurrency=1, max_pending=1)
+    assert statuses == [202, 202, 429]
+
+
+def test_job_output_is_capped():
+    """Test job output is truncated and released when the job finishes"""
+    async def main():
+        jobs = JobManager(CommandManager(), max_output_size=10)
+        try:
+            job = jobs.submit(JobRequest(["seq", "100"]))
+            lines = [line async for _, line in job.stream()]
+            await job.wait(5)
+            return job, lines, [line async for _, line in job.stream()]
+        finally:
+            jobs.close()
+
+    job, live, replayed = asyncio.run(main())
+    assert "".join(live) == "1\n2\n3\n4\n5\n"
+    assert job.result.stdout == "1\n2\n3\n4\n5\n"
+    assert job.output == []
+    assert job.to_dict()["output_truncated"] is True
+    assert replayed == live
+
+
+def test_close_waits_for_running_jobs():
+    """Test closing waits for running jobs and cancels pending ones"""
+    async def main():
+        jobs = JobManager(CommandManager(), max_concurrency=1)
+        running = jobs.submit(JobRequest(["sh", "-c", "sleep 0.3; echo ok"]))
+        pending = jobs.submit(JobRequest(["echo", "never"]))
+        await asyncio.sleep(0.1)
+        await asyncio.get_running_loop().run_in_executor(None, jobs.close)
+        assert await running.wait(1) and await pending.wait(1)
+        with pytest.raises(JobQueueFullError):
+            jobs.submit(JobRequest("true"))
+        return running, pending
+
+    running, pending = asyncio.run(main())
+    assert running.result.stdout == "ok\n"
+    assert pending.status == CommandStatus.CANCELLED
+
+
+def test_job_request_validation():
+    """Test JobRequest validation"""
+    request = JobRequest.from_dict({"command": ["ls", "-la"], "timeout": 1})
+    assert request.command == ["ls", "-la"]
+    with pytest.raises(ValueError):
+        JobRequest.from_dict([])
+    with pytest.raises(ValueError):
+        JobRequest.from_dict({"command": "ls", "env": {"A": 1}})
@@ -0,0 +1,86 @@
+"""
+Tests for the benchmark suite
+"""
+
+import json
+
+from benchmarks.suite import (Metric, compare, load_baseline, load_results,
+                              main, run, save)
+
+
+def test_compare_lower_is_better():
+    """Test regressions of metrics where lower is better"""
+    baseline = {"latency": {"value": 100.0}}
+    assert compare([Metric("latency", 120.0, "us")], baseline, 0.25) == []
+
+    regressions = compare([Metric("latency", 130.0, "us")], baseline, 0.25)
+    assert [r.name for r in regressions] == ["latency"]
+    assert regressions[0].change == 0.3
+
+
+def test_compare_higher_is_better():
+    """Test regressions of metrics where higher is better"""
+    baseline = {"throughput": {"value": 100.0}}
+    faster = Metric("throughput", 200.0, "ops/s", higher_is_better=True)
+    slower = Metric("throughput", 70.0, "ops/s", higher_is_better=True)
+    assert compare([faster], baseline, 0.25) == []
+    assert len(compare([slower], baseline, 0.25)) == 1
+
+
+def test_compare_per_metric_threshold():
+    """Test thresholds stored in the baseline override the default"""
+    baseline = {"latency": {"value": 100.0, "threshold": 1.0}}
+    assert compare([Metric("latency", 190.0, "us")], baseline, 0.25) == []
+    assert compare([Metric("unknown", 1.0, "us")], baseline, 0.25) == []
+
+
+def test_save_and_load_baseline(tmp_path):
+    """Test results round-trip through the baseline file"""
+    path = str(tmp_path / "baseline.json")
+    save(path, [Metric("latency", 1.5, "us")], quick=True)
+    assert load_baseline(path) == {
+        "latency": {"value": 1.5, "unit": "us", "higher_is_better": False}}
+    assert load_results(path)["quick"] is True
+    assert load_baseline(str(tmp_path / "missing.json")) == {}
+
+
+def test_run_quick():
+    """Test a quick run of one benchmark"""
+    metrics = run(["di"], quick=True)
+    assert {metric.name for metric in metrics} == {
+        "di.get_singleton.per_call", "di.get_scoped.per_call",
+        "di.get_transient.per_call"}
+    assert all(metric.value > 0 for metric in metrics)
+
+
+def test_main_fails_on_regression(tmp_path, capsys):
+    """Test the CLI exits with an error when a metric regresses"""
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"quick": True, "metrics": {
+        "di.get_singleton.per_call": {"value": 0.001}}}))
+    output = tmp_path / "results.json"
+
+    code = main(["--filter", "di", "--quick", "--repeat", "1",
+                 "--baseline", str(baseline), "--output", str(output)])
+    assert code == 1
+    assert "REGRESSION di.get_singleton.per_call" in capsys.readouterr().out
+    assert "di.get_scoped.per_call" in json.loads(
+        output.read_text())["metrics"]
+
+
+def test_main_skips_other_mode(tmp_path, capsys):
+    """Test quick results are not compared with a full run baseline"""
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps({"quick": False, "metrics": {
+        "di.get_singleton.per_call": {"value": 0.001}}}))
+    args = ["--filter", "di", "--quick", "--repeat", "1",
+            "--baseline", str(baseline)]
+
+    assert main(args) == 0
+    out = capsys.readouterr().out
+    assert "recorded without --quick" in out
+    assert "REGRESSION" not in out
+
+    baseline.unlink()
+    assert main(args) == 0
+    assert "--update-baseline" in capsys.readouterr().out
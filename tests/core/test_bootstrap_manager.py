@@ -0,0 +1,205 @@
+"""
+Tests for BootstrapManager
+"""
+
+import json
+import time
+
+import pytest
+
+from app.core.bootstrap_manager import BootstrapManager
+from app.core.config import Settings
+from app.core.di_container_manager import DIContainerManager
+from app.core.exceptions import BootstrapError, DependencyError
+from app.core.initializers import default_initializers
+from app.core.interfaces.command import ICommand
+from app.core.interfaces.console import IConsole
+from app.core.interfaces.initializer import IInitializer
+from app.core.interfaces.probe import IProbe
+from app.core.interfaces.state import IStateStore
+from app.core.trace_manager import tracer
+from app.core.types.enums import CommandStatus
+
+
+class FakeInitializer(IInitializer):
+    """Initializer recording its calls into a shared event list"""
+
+    def __init__(self, name, events, depends_on=(), delay=0.0, fail=False):
+        self.name = name
+        self.depends_on = depends_on
+        self.events = events
+        self.delay = delay
+        self.fail = fail
+
+    def initialize(self, container):
+        self.events.append(("start", self.name))
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.name} is broken")
+        self.events.append(("init", self.name))
+
+    def shutdown(self, container):
+        self.events.append(("shutdown", self.name))
+
+
+@pytest.fixture
+def container():
+    """Fixture for creating an empty DIContainerManager"""
+    container = DIContainerManager()
+    container.clear()
+    yield container
+    container.clear()
+
+
+@pytest.fixture
+def events():
+    """Fixture for the list of initializer events"""
+    return []
+
+
+def make_bootstrap(container, *initializers):
+    bootstrap = BootstrapManager(container)
+    for initializer in initializers:
+        bootstrap.add(initializer)
+    return bootstrap
+
+
+def test_dependencies_run_first(container, events):
+    """Test initializers start after their dependencies finished"""
+    bootstrap = make_bootstrap(
+        container,
+        FakeInitializer("app", events, depends_on=("db", "config")),
+        FakeInitializer("db", events, depends_on=("config",)),
+        FakeInitializer("config", events))
+    bootstrap.start()
+    order = [name for kind, name in events if kind == "init"]
+    assert order == ["config", "db", "app"]
+    assert events.index(("init", "db")) < events.index(("start", "app"))
+
+
+def test_independent_initializers_run_concurrently(container, events):
+    """Test independent initializers overlap"""
+    bootstrap = make_bootstrap(
+        container,
+        FakeInitializer("config", events),
+        FakeInitializer("cache", events, ("config",), delay=0.2),
+        FakeInitializer("db", events, ("config",), delay=0.2),
+        FakeInitializer("logs", events, ("config",), delay=0.2))
+    start_time = time.perf_counter()
+    report = bootstrap.start()
+    assert time.perf_counter() - start_time < 0.4
+    assert len({timing.thread for timing in report.timings}) > 1
+
+
+def test_shutdown_in_reverse_order(container, events):
+    """Test shutdown stops dependents before their dependencies"""
+    bootstrap = make_bootstrap(
+        container,
+        FakeInitializer("config", events),
+        FakeInitializer("db", events, ("config",)),
+        FakeInitializer("app", events, ("db",)))
+    with bootstrap:
+        pass
+    order = [name for kind, name in events if kind == "shutdown"]
+    assert order == ["app", "db", "config"]
+    assert all(timing.shutdown_time is not None
+               for timing in bootstrap.report.timings)
+
+    bootstrap.shutdown()
+    assert len([kind for kind, _ in events if kind == "shutdown"]) == 3
+
+
+def test_report_critical_path(container, events):
+    """Test the report shows timings and the slowest dependency chain"""
+    bootstrap = make_bootstrap(
+        container,
+        FakeInitializer("config", events),
+        FakeInitializer("fast", events, ("config",)),
+        FakeInitializer("slow", events, ("config",), delay=0.1),
+        FakeInitializer("app", events, ("fast", "slow")))
+    report = bootstrap.start()
+    assert report is bootstrap.report
+    assert report.critical_path == ["config", "slow", "app"]
+
+    timings = {timing.name: timing for timing in report.timings}
+    assert timings["slow"].duration >= 0.1
+    assert timings["app"].start >= timings["slow"].start + 0.1
+    assert "critical path: config -> slow -> app" in report.format()
+
+
+def test_failure_shuts_down_started(container, events):
+    """Test a failing initializer stops the bootstrap and rolls back"""
+    bootstrap = make_bootstrap(
+        container,
+        FakeInitializer("config", events),
+        FakeInitializer("db", events, ("config",), fail=True),
+        FakeInitializer("app", events, ("db",)))
+    with pytest.raises(BootstrapError, match="db is broken"):
+        bootstrap.start()
+    assert ("start", "app") not in events
+    assert ("shutdown", "config") in events
+    assert ("shutdown", "db") not in events
+    assert bootstrap.report.timings[-1].error == "db is broken"
+
+
+@pytest.mark.parametrize("initializers, message", [
+    ([("a", ("missing",))], "unknown initializers: missing"),
+    ([("a", ("b",)), ("b", ("c",)), ("c", ("a",)), ("d", ())],
+     "cyclic dependencies: a, b, c"),
+])
+def test_invalid_dependencies(container, events, initializers, message):
+    """Test unknown and cyclic dependencies are rejected before starting"""
+    bootstrap = make_bootstrap(
+        container, *(FakeInitializer(name, events, depends_on)
+                     for name, depends_on in initializers))
+    with pytest.raises(DependencyError, match=message):
+        bootstrap.start()
+    assert events == []
+
+
+def test_duplicate_name(container, events):
+    """Test initializer names must be unique"""
+    bootstrap = make_bootstrap(container, FakeInitializer("a", events))
+    with pytest.raises(ValueError):
+        bootstrap.add(FakeInitializer("a", events))
+
+
+def test_default_initializers(container, tmp_path):
+    """Test the core components are wired into the container"""
+    environ = {"APP_NAME": "Test", "STATE_DB": str(tmp_path / "state.db")}
+    bootstrap = make_bootstrap(
+        container, *default_initializers(environ, env_file=None))
+    with bootstrap:
+        assert container.get(Settings).app_name == "Test"
+        assert container.get(IConsole).app_name == "Test"
+        assert container.get(IConsole)._console is None
+        assert container.get(IProbe).cpu_count() > 0
+
+        command = container.get(ICommand)
+        state = container.get(IStateStore)
+        assert command.console is container.get(IConsole)
+        assert command.state is state
+        assert command.execute("true").status == CommandStatus.SUCCESS
+        state.flush()
+        assert state.last(limit=1)[0].result.command == "true"
+
+    for service_type in (Settings, IConsole, IProbe, ICommand, IStateStore):
+        assert not container.has(service_type)
+
+
+def test_tracing_from_settings(container, tmp_path):
+    """Test TRACE settings enable the tracer and export on shutdown"""
+    trace_file = tmp_path / "trace.json"
+    environ = {"TRACE": "1", "TRACE_FILE": str(trace_file)}
+    bootstrap = make_bootstrap(
+        container, *default_initializers(environ, env_file=None))
+    with bootstrap:
+        assert tracer.enabled
+        container.get(ICommand).execute("true")
+
+    assert not tracer.enabled
+    tracer.clear()
+    names = {event["name"]
+             for event in json.loads(trace_file.read_text())["traceEvents"]}
+    assert {"bootstrap.initialize", "command.execute",
+            "bootstrap.shutdown"} <= names
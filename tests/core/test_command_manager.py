@@ -2,11 +2,15 @@
 Tests for CommandManager
 """
 
+import asyncio
+import io
+
 import pytest
 from unittest.mock import patch, MagicMock, call
 import subprocess
 
 from app.core.command_manager import CommandManager
+from app.core.state_manager import StateManager
 from app.core.types.enums import CommandStatus
 from app.core.types.models import CommandResult
 
@@ -190,4 +194,156 @@ def test_execute_sudo(mock_popen, command_manager):
 
     # Verify sudo state was restored
     assert command_manager.use_sudo is False
-    assert command_manager.sudo_user is None 
\ No newline at end of file
+    assert command_manager.sudo_user is None
+
+
+def test_execute_stdin_bytes(command_manager):
+    """Test passing bytes and str as stdin"""
+    result = command_manager.execute("cat", stdin=b"bytes input")
+    assert result.status == CommandStatus.SUCCESS
+    assert result.stdout == "bytes input"
+
+    result = command_manager.execute("cat", stdin="text input")
+    assert result.stdout == "text input"
+
+
+def test_execute_stdin_path_and_fd(command_manager, tmp_path):
+    """Test passing a file path or descriptor as stdin"""
+    path = tmp_path / "input.txt"
+    path.write_text("file input")
+
+    result = command_manager.execute("cat", stdin=path)
+    assert result.status == CommandStatus.SUCCESS
+    assert result.stdout == "file input"
+
+    with open(path, "rb") as f:
+        result = command_manager.execute("cat", stdin=f.fileno())
+    assert result.stdout == "file input"
+
+    with open(path, "rb") as f:
+        result = command_manager.execute("cat", stdin=f)
+    assert result.stdout == "file input"
+
+
+def test_execute_stdin_file_like(command_manager):
+    """Test passing a file-like object without descriptor as stdin"""
+    result = command_manager.execute("cat", stdin=io.BytesIO(b"buffer"))
+    assert result.stdout == "buffer"
+
+
+def test_execute_stdin_generator_no_deadlock(command_manager):
+    """Test streaming more data than a pipe buffer holds in both ways"""
+    chunk = b"x" * 65536
+
+    def chunks():
+        for _ in range(64):
+            yield chunk
+
+    result = command_manager.execute("cat", stdin=chunks(), timeout=10)
+    assert result.status == CommandStatus.SUCCESS
+    assert len(result.stdout) == 64 * 65536
+
+
+def test_execute_stdin_async_generator(command_manager):
+    """Test streaming an async iterator as stdin"""
+    async def chunks():
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield f"line {i}\n"
+
+    result = command_manager.execute("cat", stdin=chunks())
+    assert result.stdout == "line 0\nline 1\nline 2\n"
+
+
+def test_execute_stdin_closed_early(command_manager):
+    """Test the process exiting before consuming stdin"""
+    def chunks():
+        while True:
+            yield b"y" * 65536
+
+    result = command_manager.execute("head -c 10", stdin=chunks(),
+                                     timeout=10)
+    assert result.status == CommandStatus.SUCCESS
+    assert result.stdout == "y" * 10
+
+
+def test_execute_stdin_iterator_error(command_manager):
+    """Test errors raised by the stdin iterator fail the command"""
+    def chunks():
+        yield b"data"
+        raise RuntimeError("producer failed")
+
+    result = command_manager.execute("cat", stdin=chunks())
+    assert result.status == CommandStatus.FAILED
+    assert result.error == "producer failed"
+
+
+def test_execute_stdin_unsupported(command_manager):
+    """Test unsupported stdin types fail the command"""
+    result = command_manager.execute("cat", stdin=1.5)
+    assert result.status == CommandStatus.FAILED
+
+
+def test_execute_records_state(command_manager):
+    """Test results are recorded in the state store"""
+    mock_state = MagicMock()
+    command_manager.set_state(mock_state)
+
+    result = command_manager.execute("true")
+    mock_state.record.assert_called_once_with(
+        result, {"cwd": None, "sudo": False})
+
+
+def test_execute_records_path_cwd(command_manager, tmp_path):
+    """Test a Path working directory is recorded without failing"""
+    state = StateManager(str(tmp_path / "state.db"))
+    command_manager.set_state(state)
+    try:
+        result = command_manager.execute("pwd", cwd=tmp_path)
+        assert result.status == CommandStatus.SUCCESS
+        state.flush()
+        assert state.last()[0].metadata["cwd"] == str(tmp_path)
+    finally:
+        state.close()
+
+
+def test_execute_with_closed_state(command_manager, tmp_path):
+    """Test commands still run after the state store is closed"""
+    state = StateManager(str(tmp_path / "state.db"))
+    state.close()
+    command_manager.set_state(state)
+    assert command_manager.execute("true").status == CommandStatus.SUCCESS
+
+
+def test_execute_with_failing_state(command_manager, mock_console):
+    """Test errors of the state store are logged, not raised"""
+    mock_state = MagicMock()
+    mock_state.record.side_effect = RuntimeError("disk full")
+    command_manager.set_state(mock_state)
+    command_manager.set_console(mock_console)
+
+    assert command_manager.execute("true").status == CommandStatus.SUCCESS
+    mock_console.error.assert_called_once_with(
+        "Failed to record command result: disk full")
+
+
+def test_execute_on_output(command_manager):
+    """Test output lines are streamed to the callback"""
+    lines = []
+    result = command_manager.execute(
+        ["sh", "-c", "echo one; echo two >&2; echo three"],
+        on_output=lambda stream, line: lines.append((stream, line)))
+
+    assert result.status == CommandStatus.SUCCESS
+    assert result.stdout == "one\nthree\n"
+    assert result.stderr == "two\n"
+    assert [line for line in lines if line[0] == "stdout"] == [
+        ("stdout", "one\n"), ("stdout", "three\n")]
+    assert ("stderr", "two\n") in lines
+
+
+def test_execute_on_output_timeout(command_manager):
+    """Test streamed commands still time out"""
+    result = command_manager.execute("sleep 5", timeout=0.2,
+                                     on_output=lambda stream, line: None)
+    assert result.status == CommandStatus.TIMEOUT
@@ -0,0 +1,72 @@
+"""
+Tests for configuration
+"""
+
+from pathlib import Path
+
+import pytest
+
+from app.core.config import (MIN_TOKEN_LENGTH, Settings, check_token,
+                             load_env_file)
+from app.core.exceptions import ConfigError
+
+
+def test_load_env_file(tmp_path):
+    """Test parsing a .env file with comments"""
+    path = tmp_path / ".env"
+    path.write_text("# comment\nAPP_ENV=staging  # inline\n\nPORT='9000'\n")
+    assert load_env_file(str(path)) == {"APP_ENV": "staging", "PORT": "9000"}
+    assert load_env_file(str(tmp_path / "missing")) == {}
+
+
+def test_settings_from_env(tmp_path):
+    """Test environment overrides values from the .env file"""
+    path = tmp_path / ".env"
+    path.write_text("API_PORT=9000\nDEBUG=True\nAPI_PREFIX=/x\n"
+                    "HOST=0.0.0.0\nAPI_TOKEN=t\nAGENT_TOKEN=a\n")
+    settings = Settings.from_env({"API_PORT": "9100"}, env_file=str(path))
+    assert settings.api_port == 9100
+    assert settings.debug is True
+    assert settings.api_prefix == "/x"
+    assert settings.api_host == "127.0.0.1"
+    assert settings.api_token == "t"
+    assert settings.agent_token == "a"
+
+
+@pytest.mark.parametrize("token", [
+    "", "your-secret-key-here", "CHANGEME", "short-token"])
+def test_check_token_rejects(token):
+    """Test empty, placeholder and short tokens are refused"""
+    with pytest.raises(ConfigError, match="API_TOKEN"):
+        check_token(token, "API_TOKEN")
+
+
+def test_check_token():
+    """Test a long random token is accepted"""
+    token = "x" * MIN_TOKEN_LENGTH
+    assert check_token(token, "API_TOKEN") == token
+    # The committed .env must not provide a working token
+    env_file = Path(__file__).parents[2] / ".env"
+    settings = Settings.from_env({}, str(env_file))
+    assert settings.api_token == ""
+    assert settings.agent_token == ""
+
+
+def test_state_retention_settings():
+    """Test the state retention limits"""
+    settings = Settings.from_env({"STATE_MAX_AGE": "60",
+                                  "STATE_MAX_ROWS": "0"})
+    assert settings.state_max_age == 60.0
+    assert settings.state_max_rows == 0
+    assert Settings.from_env({}).state_max_rows > 0
+
+
+def test_trace_settings():
+    """Test tracing settings"""
+    settings = Settings.from_env({"TRACE": "true",
+                                  "TRACE_SAMPLE_RATE": "0.5",
+                                  "TRACE_FILE": "trace.json"})
+    assert settings.trace is True
+    assert settings.trace_sample_rate == 0.5
+    assert settings.trace_file == "trace.json"
+    assert Settings.from_env({}).trace is False
@@ -34,6 +34,15 @@ def test_console_manager_initialization():
     assert manager.app_name == "App"
 
 
+def test_console_created_lazily():
+    """Test rich console is created on first use only"""
+    manager = ConsoleManager(app_name="TestApp")
+    manager.debug("Hidden message")
+    assert manager._console is None
+    assert isinstance(manager.console, Console)
+    assert manager.console is manager.console
+
+
 @patch('rich.console.Console.print')
 def test_log_without_module_prefix(mock_print, console_manager):
     """Test logging without module prefix"""
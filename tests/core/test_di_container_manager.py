@@ -0,0 +1,265 @@
+"""
+Tests for DIContainerManager
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from app.core.di_container_manager import DIContainerManager
+from app.core.exceptions import DIContainerError, ScopeNotActiveError
+from app.core.types.enums import ServiceLifetime
+
+
+class Service:
+    """Dummy service for container tests"""
+
+
+class OtherService:
+    """Second dummy service for container tests"""
+
+
+@pytest.fixture
+def container():
+    """Fixture for creating an empty DIContainerManager"""
+    container = DIContainerManager()
+    container.clear()
+    yield container
+    container.clear()
+
+
+def test_container_is_singleton():
+    """Test that the container is a process-wide singleton"""
+    assert DIContainerManager() is DIContainerManager()
+
+
+def test_singleton_instance_under_concurrency():
+    """Test concurrent construction returns the same container"""
+    instances = []
+    threads = [threading.Thread(
+        target=lambda: instances.append(DIContainerManager()))
+        for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert all(instance is instances[0] for instance in instances)
+
+
+def test_register_and_get(container):
+    """Test registering and getting an instance"""
+    service = Service()
+    container.register(Service, service)
+    assert container.get(Service) is service
+    assert container.has(Service)
+
+
+def test_register_wrong_type(container):
+    """Test registering an instance of the wrong type"""
+    with pytest.raises(ValueError):
+        container.register(Service, object())
+
+
+def test_get_unknown_service(container):
+    """Test getting a service that is not registered"""
+    assert container.get(Service) is None
+    assert not container.has(Service)
+
+
+def test_transient_factory(container):
+    """Test transient factories create a new instance on every get"""
+    container.register_factory(Service, Service)
+    assert container.get(Service) is not container.get(Service)
+    assert container.get_stats()[Service].resolutions == 2
+
+
+def test_singleton_factory(container):
+    """Test singleton factories are called once"""
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return Service()
+
+    container.register_factory(Service, factory, ServiceLifetime.SINGLETON)
+    assert container.get(Service) is container.get(Service)
+    assert len(calls) == 1
+
+
+def test_singleton_factory_under_concurrency(container):
+    """Test singleton factory runs once when resolved concurrently"""
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.01)
+        return Service()
+
+    container.register_factory(Service, factory, ServiceLifetime.SINGLETON)
+    results = []
+    threads = [threading.Thread(
+        target=lambda: results.append(container.get(Service)))
+        for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_slow_singleton_does_not_block_others(container):
+    """Test a slow singleton factory does not block other services"""
+    started = threading.Event()
+
+    def slow_factory():
+        started.set()
+        time.sleep(0.5)
+        return Service()
+
+    container.register_factory(Service, slow_factory,
+                               ServiceLifetime.SINGLETON)
+    container.register_factory(OtherService, OtherService,
+                               ServiceLifetime.SINGLETON)
+    thread = threading.Thread(target=container.get, args=(Service,))
+    thread.start()
+    started.wait()
+
+    start_time = time.perf_counter()
+    assert isinstance(container.get(OtherService), OtherService)
+    container.register(int, 1)
+    assert time.perf_counter() - start_time < 0.2
+    thread.join()
+
+
+def test_singleton_factory_resolving_in_thread(container):
+    """Test a factory may resolve other singletons from another thread"""
+    def factory():
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(container.get(OtherService)))
+        thread.start()
+        thread.join(timeout=2)
+        assert result, "resolution from another thread deadlocked"
+        return Service()
+
+    container.register_factory(Service, factory, ServiceLifetime.SINGLETON)
+    container.register_factory(OtherService, OtherService,
+                               ServiceLifetime.SINGLETON)
+    assert isinstance(container.get(Service), Service)
+
+
+def test_singleton_factory_returning_none(container):
+    """Test a singleton factory returning None is called once"""
+    calls = []
+    container.register_factory(Service, lambda: calls.append(1),
+                               ServiceLifetime.SINGLETON)
+    assert container.get(Service) is None
+    assert container.get(Service) is None
+    assert len(calls) == 1
+
+
+def test_register_factory_over_instance(container):
+    """Test a factory does not silently replace a registered instance"""
+    service = Service()
+    container.register(Service, service)
+    with pytest.raises(DIContainerError):
+        container.register_factory(Service, Service)
+    assert container.get(Service) is service
+
+    container.remove(Service)
+    container.register_factory(Service, Service, ServiceLifetime.SINGLETON)
+    container.get(Service)
+    container.register_factory(Service, Service)
+    container.register(Service, service)
+    assert container.get(Service) is service
+
+
+def test_scoped_factory(container):
+    """Test scoped factories are shared within a scope only"""
+    container.register_factory(Service, Service, ServiceLifetime.SCOPED)
+
+    with container.create_scope():
+        first = container.get(Service)
+        assert container.get(Service) is first
+
+    with container.create_scope():
+        assert container.get(Service) is not first
+
+
+def test_scoped_factory_outside_scope(container):
+    """Test scoped services require an active scope"""
+    container.register_factory(Service, Service, ServiceLifetime.SCOPED)
+    with pytest.raises(ScopeNotActiveError):
+        container.get(Service)
+
+
+def test_scoped_factory_per_task(container):
+    """Test each asyncio task gets its own scope"""
+    container.register_factory(Service, Service, ServiceLifetime.SCOPED)
+
+    async def resolve():
+        with container.create_scope():
+            first = container.get(Service)
+            await asyncio.sleep(0)
+            assert container.get(Service) is first
+            return first
+
+    async def main():
+        return await asyncio.gather(resolve(), resolve())
+
+    first, second = asyncio.run(main())
+    assert first is not second
+
+
+def test_scoped_factory_in_thread(container):
+    """Test threads share the scope only through a copied context"""
+    container.register_factory(Service, Service, ServiceLifetime.SCOPED)
+    results = {}
+
+    def resolve(key):
+        try:
+            results[key] = container.get(Service)
+        except ScopeNotActiveError as e:
+            results[key] = e
+
+    with container.create_scope():
+        first = container.get(Service)
+        plain = threading.Thread(target=resolve, args=("plain",))
+        context = contextvars.copy_context()
+        copied = threading.Thread(target=context.run,
+                                  args=(resolve, "copied"))
+        for thread in (plain, copied):
+            thread.start()
+            thread.join()
+
+    assert isinstance(results["plain"], ScopeNotActiveError)
+    assert results["copied"] is first
+
+
+def test_stats(container):
+    """Test resolution statistics are recorded per service"""
+    container.register_factory(Service, Service, ServiceLifetime.SINGLETON)
+    container.get(Service)
+    container.get(Service)
+
+    stats = container.get_stats()[Service]
+    assert stats.resolutions == 1
+    assert stats.total_time >= 0
+    assert stats.min_time <= stats.avg_time <= stats.max_time
+
+
+def test_remove_and_clear(container):
+    """Test removing and clearing services"""
+    container.register(Service, Service())
+    container.remove(Service)
+    assert not container.has(Service)
+
+    container.register_factory(Service, Service)
+    container.clear()
+    assert not container.has(Service)
+    assert container.get_stats() == {}
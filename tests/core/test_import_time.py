@@ -0,0 +1,46 @@
+"""
+Tests for the import time budget of the core package
+"""
+
+from benchmarks.import_time import (IMPORT_TIME_BUDGET_MS,
+                                    IMPORT_TIME_BUDGET_RATIO, ImportReport,
+                                    measure, parse_importtime)
+
+
+def test_parse_importtime():
+    """Test parsing -X importtime output"""
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       100 |        100 |   typing\n"
+        "import time:        50 |        150 | app.core\n"
+    )
+    entries = parse_importtime(output)
+    assert [entry.module for entry in entries] == ["typing", "app.core"]
+    assert entries[0].depth == 1
+    assert entries[1].depth == 0
+    assert entries[1].cumulative_us == 150
+
+
+def test_core_does_not_load_heavy_modules():
+    """Test importing core managers defers rich and subprocess"""
+    report = measure(runs=1)
+    assert report.loaded_heavy == []
+
+
+def test_core_import_time_budget():
+    """Test cold import of the core package stays within budget"""
+    report = measure(runs=3)
+    budget_ms = report.budget_ms(IMPORT_TIME_BUDGET_MS)
+    assert report.total_ms <= budget_ms, (
+        f"core import took {report.total_ms:.1f}ms, "
+        f"budget is {budget_ms:.1f}ms")
+
+
+def test_relative_budget():
+    """Test the default budget scales with the interpreter startup"""
+    report = ImportReport(entries=parse_importtime(
+        "import time:      1000 |       1000 | site\n"
+        "import time:      5000 |       5000 | app\n"), loaded_heavy=[])
+    assert report.startup_us == 1000
+    assert report.budget_ms() == IMPORT_TIME_BUDGET_RATIO
+    assert report.budget_ms(5.0) == 5.0
@@ -0,0 +1,129 @@
+"""
+Tests for ProbeManager
+"""
+
+import os
+import subprocess
+import time
+
+import pytest
+
+from app.core.probe_manager import ProbeManager
+
+
+@pytest.fixture
+def probe():
+    """Fixture for creating ProbeManager instance"""
+    with ProbeManager() as probe:
+        yield probe
+
+
+def test_read_reuses_descriptor(probe):
+    """Test repeated reads use the same open file"""
+    first = probe.read("/proc/uptime")
+    fd = probe._fds["/proc/uptime"]
+    second = probe.read("/proc/uptime")
+    assert probe._fds["/proc/uptime"] == fd
+    assert float(second.split()[0]) >= float(first.split()[0])
+
+
+def test_read_does_not_cache_other_files(probe):
+    """Test per-process files are not kept open"""
+    process = subprocess.Popen(["sleep", "10"])
+    path = f"/proc/{process.pid}/stat"
+    try:
+        assert probe.read(path)
+        assert path not in probe._fds
+    finally:
+        process.kill()
+        process.wait()
+    assert probe.process(process.pid) is None
+
+
+def test_read_large_file(probe):
+    """Test files larger than one read are read completely"""
+    with open("/proc/self/maps") as f:
+        expected_start = f.readline()
+    assert probe.read("/proc/self/maps").startswith(expected_start)
+
+
+def test_uptime_and_load(probe):
+    """Test uptime and load average"""
+    uptime = probe.uptime()
+    assert uptime.uptime > 0
+    assert uptime.load.load_1 == pytest.approx(os.getloadavg()[0], abs=1)
+    assert uptime.load.total >= uptime.load.running
+
+
+def test_memory(probe):
+    """Test memory usage"""
+    memory = probe.memory()
+    assert memory.total > 0
+    assert 0 <= memory.free <= memory.total
+    assert 0 <= memory.available <= memory.total
+    assert memory.swap_used >= 0
+
+
+def test_cpu_count(probe):
+    """Test CPU count matches the affinity mask"""
+    assert probe.cpu_count() == len(os.sched_getaffinity(0))
+
+
+def test_disk_usage(probe):
+    """Test filesystem usage"""
+    usage = probe.disk_usage("/")
+    stat = os.statvfs("/")
+    assert usage.total == stat.f_blocks * stat.f_frsize
+    assert usage.used + usage.free == usage.total
+    assert 0 <= usage.percent <= 100
+
+
+def test_disks(probe):
+    """Test listing mounted filesystems"""
+    disks = probe.disks()
+    assert disks
+    assert all(disk.total > 0 for disk in disks)
+    assert all(disk.fstype not in ("proc", "sysfs") for disk in disks)
+
+
+def test_processes(probe):
+    """Test listing processes"""
+    processes = {process.pid: process for process in probe.processes()}
+    current = processes[os.getpid()]
+    assert current.ppid == os.getppid()
+    assert current.threads >= 1
+    assert current.rss > 0
+    assert current.start_time <= time.time() + 1
+
+
+def test_missing_process(probe):
+    """Test probing a process that does not exist"""
+    assert probe.process(2 ** 22 + 1) is None
+
+
+def test_snapshot(probe):
+    """Test batch snapshot"""
+    snapshot = probe.snapshot()
+    assert snapshot.uptime.uptime > 0
+    assert snapshot.memory.total > 0
+    assert snapshot.cpu_count >= 1
+    assert snapshot.disks
+
+
+def test_warm(probe):
+    """Test warming opens the cached files and reads the boot time"""
+    probe.warm()
+    assert "/proc/uptime" in probe._fds
+    assert "/proc/loadavg" in probe._fds
+    assert 0 < probe._boot_time < time.time()
+
+
+def test_close():
+    """Test closing releases open descriptors"""
+    probe = ProbeManager()
+    probe.read("/proc/uptime")
+    fd = probe._fds["/proc/uptime"]
+    probe.close()
+    assert probe._fds == {}
+    with pytest.raises(OSError):
+        os.fstat(fd)
@@ -0,0 +1,184 @@
+"""
+Tests for StateManager
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.state_manager import (DEFAULT_MAX_AGE, DEFAULT_MAX_ROWS,
+                                    StateManager)
+from app.core.types.enums import CommandStatus
+from app.core.types.models import CommandResult
+
+
+def make_result(command="ls -la",
+                status=CommandStatus.SUCCESS,
+                execution_time=0.1):
+    """Helper for creating command results"""
+    return CommandResult(
+        status=status,
+        return_code=0 if status == CommandStatus.SUCCESS else 1,
+        command=command,
+        stdout="out",
+        stderr="" if status == CommandStatus.SUCCESS else "err",
+        execution_time=execution_time,
+        error=None if status == CommandStatus.SUCCESS else "err"
+    )
+
+
+@pytest.fixture
+def state(tmp_path):
+    """Fixture for creating StateManager instance"""
+    manager = StateManager(str(tmp_path / "state.db"))
+    yield manager
+    manager.close()
+
+
+def test_wal_mode(state):
+    """Test the database is opened in WAL mode"""
+    mode = sqlite3.connect(state.path).execute(
+        "PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_record_and_last(state):
+    """Test recorded results are persisted"""
+    state.record(make_result("ls -la"), {"host": "a"})
+    state.record(make_result("df -h"))
+    assert state.flush(timeout=5)
+
+    records = state.last()
+    assert [r.result.command for r in records] == ["df -h", "ls -la"]
+    assert records[1].metadata == {"host": "a"}
+    assert records[1].program == "ls"
+    assert records[1].result.status == CommandStatus.SUCCESS
+
+
+def test_program_strips_sudo():
+    """Test program name is extracted from sudo commands"""
+    assert StateManager._program("sudo -u root /usr/bin/apt update") == "apt"
+    assert StateManager._program("sudo df") == "df"
+
+
+def test_last_failures(state):
+    """Test querying the latest failures of a command"""
+    state.record(make_result("apt update", CommandStatus.FAILED))
+    state.record(make_result("apt update"))
+    state.record(make_result("apt update", CommandStatus.TIMEOUT))
+    state.record(make_result("df -h", CommandStatus.FAILED))
+    state.flush(timeout=5)
+
+    failures = state.last_failures("apt update")
+    assert [r.result.status for r in failures] == [
+        CommandStatus.TIMEOUT, CommandStatus.FAILED]
+    assert len(state.last_failures("apt update", limit=1)) == 1
+
+
+def test_duration_percentile(state):
+    """Test percentile of execution time per program"""
+    for i in range(1, 101):
+        state.record(make_result("ls", execution_time=i / 100))
+    state.record(make_result("df", execution_time=2.0))
+    state.flush(timeout=5)
+
+    p95 = state.duration_percentile(95)
+    assert p95["ls"] == pytest.approx(0.95)
+    assert p95["df"] == pytest.approx(2.0)
+    assert state.duration_percentile(50)["ls"] == pytest.approx(0.5)
+    assert state.duration_percentile(95, since=time.time() + 60) == {}
+
+    with pytest.raises(ValueError):
+        state.duration_percentile(0)
+
+
+def test_apply_retention(state):
+    """Test retention by row count and age"""
+    for _ in range(10):
+        state.record(make_result())
+    state.flush(timeout=5)
+
+    assert state.apply_retention(max_rows=4) == 6
+    assert len(state.last(limit=100)) == 4
+    assert state.apply_retention(max_age=3600) == 0
+    assert state.apply_retention(max_age=0) == 4
+    state.compact()
+    assert state.last() == []
+
+
+def test_automatic_retention(tmp_path):
+    """Test the writer applies configured retention"""
+    state = StateManager(str(tmp_path / "state.db"), max_rows=3,
+                         retention_interval=0)
+    for _ in range(10):
+        state.record(make_result())
+    state.flush(timeout=5)
+    state.record(make_result())
+    state.flush(timeout=5)
+    assert len(state.last(limit=100)) <= 4
+    state.close()
+
+
+def test_retention_compacts_file(tmp_path):
+    """Test the writer returns the space of deleted records to the disk"""
+    path = tmp_path / "state.db"
+    state = StateManager(str(path), max_rows=10, retention_interval=0)
+    result = make_result()
+    result.stdout = "x" * 10000
+    for _ in range(500):
+        state.record(result)
+    state.flush(timeout=5)
+    state.flush(timeout=5)
+
+    assert len(state.last(limit=100)) <= 10
+    freelist = sqlite3.connect(str(path)).execute(
+        "PRAGMA freelist_count").fetchone()[0]
+    assert freelist == 0
+    state.close()
+    assert path.stat().st_size < 500 * 1024
+
+
+def test_default_retention(state):
+    """Test retention limits are on by default"""
+    assert state.max_age == DEFAULT_MAX_AGE
+    assert state.max_rows == DEFAULT_MAX_ROWS
+
+
+def test_flush_racing_close(tmp_path):
+    """Test flush never waits for a writer that already stopped"""
+    for _ in range(20):
+        state = StateManager(str(tmp_path / "state.db"))
+        closer = threading.Thread(target=state.close)
+        closer.start()
+        assert state.flush(timeout=5)
+        closer.join()
+
+
+def test_truncates_output(tmp_path):
+    """Test stdout is truncated to max_output_size"""
+    state = StateManager(str(tmp_path / "state.db"), max_output_size=2)
+    state.record(make_result())
+    state.close()
+
+    state = StateManager(str(tmp_path / "state.db"))
+    assert state.last()[0].result.stdout == "ou"
+    state.close()
+
+
+def test_record_after_close(state):
+    """Test recording into a closed store drops the result"""
+    state.console = MagicMock()
+    state.close()
+    state.record(make_result())
+    state.console.warning.assert_called_once()
+
+
+def test_record_metadata_not_serializable(state):
+    """Test metadata values that are not JSON are stored as strings"""
+    state.record(make_result(), {"cwd": Path("/tmp"), "sudo": False})
+    state.flush()
+    assert state.last()[0].metadata == {"cwd": "/tmp", "sudo": False}
@@ -0,0 +1,127 @@
+"""
+Tests for TraceManager
+"""
+
+import asyncio
+import io
+import json
+import threading
+
+import pytest
+
+from app.core.command_manager import CommandManager
+from app.core.trace_manager import NOOP_SPAN, TraceManager, tracer
+
+
+@pytest.fixture
+def trace():
+    """Fixture for creating an enabled TraceManager instance"""
+    return TraceManager(enabled=True)
+
+
+@pytest.fixture
+def global_tracer():
+    """Fixture enabling the process-wide tracer for one test"""
+    tracer.clear()
+    tracer.configure(enabled=True, sample_rate=1.0)
+    yield tracer
+    tracer.configure(enabled=False)
+    tracer.clear()
+
+
+def test_disabled_is_noop():
+    """Test disabled tracing returns the shared no-op span"""
+    trace = TraceManager()
+    with trace.span("noop", key="value") as span:
+        span.set("other", 1)
+    assert span is NOOP_SPAN
+    assert trace.spans == []
+
+
+def test_nesting_and_attributes(trace):
+    """Test nested spans record parents and attributes"""
+    with trace.span("outer", "test", size=3) as outer:
+        with trace.span("inner") as inner:
+            inner.set("done", True)
+
+    assert [span.name for span in trace.spans] == ["inner", "outer"]
+    assert inner.parent is outer
+    assert outer.parent is None
+    assert outer.attributes == {"size": 3}
+    assert inner.attributes == {"done": True}
+    assert outer.start_ns <= inner.start_ns <= inner.end_ns <= outer.end_ns
+    assert inner.thread_id == threading.get_ident()
+
+
+def test_error_attribute(trace):
+    """Test exceptions are recorded on the span"""
+    with pytest.raises(ValueError):
+        with trace.span("failing"):
+            raise ValueError("boom")
+    assert trace.spans[0].attributes["error"] == "ValueError: boom"
+
+
+def test_sampling_drops_whole_trace():
+    """Test children of an unsampled root are dropped"""
+    trace = TraceManager(enabled=True, sample_rate=0.0)
+    with trace.span("root"):
+        with trace.span("child"):
+            pass
+    assert trace.spans == []
+
+    with pytest.raises(ValueError):
+        trace.configure(sample_rate=2)
+
+
+def test_max_spans():
+    """Test the span buffer is bounded"""
+    trace = TraceManager(enabled=True, max_spans=2)
+    for i in range(5):
+        with trace.span(f"span {i}"):
+            pass
+    assert [span.name for span in trace.spans] == ["span 3", "span 4"]
+
+
+def test_task_names(trace):
+    """Test spans inside asyncio tasks record the task"""
+    async def work():
+        with trace.span("in task"):
+            await asyncio.sleep(0)
+
+    async def main():
+        await asyncio.gather(
+            asyncio.ensure_future(work()), asyncio.ensure_future(work()))
+
+    asyncio.run(main())
+    tasks = {span.task for span in trace.spans}
+    assert len(tasks) == 2
+    assert None not in tasks
+
+
+def test_chrome_trace_export(trace):
+    """Test export in the Chrome trace-event format"""
+    with trace.span("outer", "test", obj=object()):
+        with trace.span("inner"):
+            pass
+
+    output = io.StringIO()
+    trace.export_chrome_trace(output)
+    events = json.loads(output.getvalue())["traceEvents"]
+
+    complete = [event for event in events if event["ph"] == "X"]
+    assert [event["name"] for event in complete] == ["inner", "outer"]
+    assert complete[1]["cat"] == "test"
+    assert complete[1]["dur"] >= complete[0]["dur"]
+    assert isinstance(complete[1]["args"]["obj"], str)
+    assert any(event["ph"] == "M" for event in events)
+
+
+def test_command_manager_instrumented(global_tracer):
+    """Test command execution emits nested spans"""
+    CommandManager().execute("true")
+    names = [span.name for span in global_tracer.spans]
+    assert names == ["command.build", "command.spawn", "command.wait",
+                     "command.execute"]
+    root = global_tracer.spans[-1]
+    assert root.attributes == {"command": "true", "status": "success"}
+    assert all(span.parent is root for span in global_tracer.spans[:-1])
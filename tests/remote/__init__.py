@@ -0,0 +1,3 @@
+"""
+Remote execution tests package
+"""
@@ -0,0 +1,317 @@
+"""
+Tests for WorkerAgent and RemoteCommandManager
+"""
+
+import asyncio
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.command_manager import CommandManager
+from app.core.types.enums import CommandStatus
+from app.remote.agent import WorkerAgent
+from app.remote.manager import RemoteCommandManager
+from app.remote.protocol import (encode_frame, open_connection, parse_address,
+                                 read_frame, sign_challenge)
+
+TOKEN = "test-token"
+
+
+class AgentCluster:
+    """Helper running worker agents on a background event loop"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever,
+                                       daemon=True)
+        self.thread.start()
+        self.agents = []
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine,
+                                                self.loop).result()
+
+    def start(self, address="127.0.0.1:0", max_concurrency=4):
+        agent = WorkerAgent(CommandManager(), address, TOKEN, max_concurrency)
+        self._call(agent.start())
+        self.agents.append(agent)
+        return agent
+
+    def stop(self, agent):
+        self._call(agent.close())
+
+    def close(self):
+        for agent in self.agents:
+            self._call(agent.close())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+@pytest.fixture
+def cluster():
+    """Fixture for running worker agents"""
+    cluster = AgentCluster()
+    yield cluster
+    cluster.close()
+
+
+@pytest.fixture
+def remote(cluster):
+    """Fixture for a remote command manager on three agents"""
+    agents = [cluster.start() for _ in range(3)]
+    manager = RemoteCommandManager([agent.address for agent in agents], TOKEN,
+                                   health_interval=0.1)
+    yield manager
+    manager.close()
+
+
+def test_parse_address():
+    """Test parsing agent addresses"""
+    assert parse_address("127.0.0.1:7100") == ("127.0.0.1", 7100)
+    assert parse_address("unix:/tmp/agent.sock") == "/tmp/agent.sock"
+    with pytest.raises(ValueError):
+        parse_address("localhost")
+
+
+def test_requires_agents():
+    """Test an agent list is required"""
+    with pytest.raises(ValueError):
+        RemoteCommandManager([], TOKEN)
+
+
+def test_execute(remote):
+    """Test remote execution returns the command result"""
+    result = remote.execute("echo hello")
+    assert result.status == CommandStatus.SUCCESS
+    assert result.stdout == "hello\n"
+    assert result.command == "echo hello"
+
+    result = remote.execute(["sh", "-c", "exit 3"])
+    assert result.status == CommandStatus.FAILED
+    assert result.return_code == 3
+
+
+def test_execute_stdin_sources(remote, tmp_path):
+    """Test every stdin source type is sent to the agent"""
+    async def chunks():
+        for chunk in (b"async ", "chunks"):
+            yield chunk
+
+    path = tmp_path / "input"
+    path.write_bytes(b"file")
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, b"descriptor")
+    os.close(write_fd)
+
+    try:
+        sources = [chunks(), read_fd, path, iter([b"a", "b"]),
+                   io.StringIO("text")]
+        outputs = [remote.execute("cat", stdin=source).stdout
+                   for source in sources]
+    finally:
+        os.close(read_fd)
+    assert outputs == ["async chunks", "descriptor", "file", "ab", "text"]
+
+
+def test_execute_stdin_too_large(remote, monkeypatch):
+    """Test input beyond the frame limit fails the command"""
+    monkeypatch.setattr("app.remote.manager.MAX_STDIN_SIZE", 4)
+    result = remote.execute("cat", stdin=b"12345")
+    assert result.status == CommandStatus.FAILED
+    assert "exceeds 4 bytes" in result.error
+
+
+def test_execute_stdin_and_stream(remote):
+    """Test stdin is sent and output is streamed back"""
+    lines = []
+    result = remote.execute(
+        ["sh", "-c", "cat; echo done >&2"], stdin=b"one\ntwo\n",
+        on_output=lambda stream, line: lines.append((stream, line)))
+
+    assert result.stdout == "one\ntwo\n"
+    assert ("stdout", "one\n") in lines
+    assert ("stderr", "done\n") in lines
+
+
+def test_build_command_with_sudo(remote):
+    """Test sudo prefix is built on the client"""
+    remote.use_sudo = True
+    remote.sudo_user = "test_user"
+    assert remote._build_command("ls -la") == [
+        "sudo", "-u", "test_user", "ls", "-la"]
+
+
+def test_load_based_dispatch(remote):
+    """Test concurrent commands are spread over agents"""
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(
+            lambda _: remote.execute("sleep 0.3"), range(6)))
+
+    assert all(r.status == CommandStatus.SUCCESS for r in results)
+    completed = [status.completed for status in remote.agents_status()]
+    assert completed == [2, 2, 2]
+
+
+def test_agent_failure(cluster, remote):
+    """Test a stopped agent is marked unhealthy and skipped"""
+    assert remote.execute("true").status == CommandStatus.SUCCESS
+    cluster.stop(cluster.agents[0])
+
+    statuses = remote.check_agents()
+    assert [status.healthy for status in statuses] == [False, True, True]
+    assert statuses[0].last_error
+
+    for _ in range(5):
+        assert remote.execute("true").status == CommandStatus.SUCCESS
+
+
+def test_no_healthy_agents(cluster):
+    """Test commands fail when no agent is reachable"""
+    agent = cluster.start()
+    address = agent.address
+    cluster.stop(agent)
+
+    remote = RemoteCommandManager([address], TOKEN, connect_timeout=0.5)
+    result = remote.execute("true")
+    remote.close()
+    assert result.status == CommandStatus.FAILED
+    assert "No healthy agents" in result.error
+
+
+def test_unix_socket(cluster, tmp_path):
+    """Test agents listening on a unix socket"""
+    agent = cluster.start(f"unix:{tmp_path / 'agent.sock'}")
+    remote = RemoteCommandManager([agent.address], TOKEN)
+    mock_state = MagicMock()
+    remote.set_state(mock_state)
+
+    result = remote.execute("echo unix")
+    remote.close()
+    assert result.stdout == "unix\n"
+    mock_state.record.assert_called_once()
+
+
+def test_reconnect(cluster):
+    """Test the manager reconnects when an agent comes back"""
+    agent = cluster.start()
+    address = agent.address
+    remote = RemoteCommandManager([address], TOKEN, health_interval=0.05)
+    assert remote.execute("true").status == CommandStatus.SUCCESS
+
+    cluster.stop(agent)
+    assert not remote.check_agents()[0].healthy
+
+    cluster.start(address)
+    deadline = time.time() + 5
+    while not remote.agents_status()[0].healthy and time.time() < deadline:
+        time.sleep(0.05)
+    assert remote.execute("true").status == CommandStatus.SUCCESS
+    remote.close()
+
+
+def test_wrong_token(cluster):
+    """Test agents reject managers with a wrong token"""
+    agent = cluster.start()
+    remote = RemoteCommandManager([agent.address], "wrong",
+                                  connect_timeout=0.5)
+    result = remote.execute("true")
+    status = remote.agents_status()[0]
+    remote.close()
+    assert result.status == CommandStatus.FAILED
+    assert not status.healthy
+    assert status.last_error == "Agent rejected the token"
+
+
+def test_unauthenticated_execute(cluster, tmp_path):
+    """Test agents do not run requests sent before the handshake"""
+    agent = cluster.start()
+    marker = tmp_path / "marker"
+
+    async def scenario():
+        reader, writer = await open_connection(agent.address)
+        challenge = await read_frame(reader)
+        writer.write(encode_frame({"type": "execute", "id": 1,
+                                   "command": ["touch", str(marker)]}))
+        reply = await read_frame(reader)
+        closed = await reader.read() == b""
+        writer.close()
+        return challenge, reply, closed
+
+    challenge, reply, closed = asyncio.run(scenario())
+    assert challenge["type"] == "challenge"
+    assert reply == {"type": "auth", "ok": False}
+    assert closed
+    time.sleep(0.1)
+    assert not marker.exists()
+
+
+def test_timeout_enforced_by_client(cluster):
+    """Test the timeout holds while the agent is busy with other commands"""
+    agent = cluster.start(max_concurrency=1)
+    remote = RemoteCommandManager([agent.address], TOKEN)
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            busy = executor.submit(remote.execute, "sleep 3")
+            time.sleep(0.2)
+            start_time = time.perf_counter()
+            result = remote.execute("true", timeout=0.5)
+            elapsed = time.perf_counter() - start_time
+            busy.result()
+    finally:
+        remote.close()
+    assert result.status == CommandStatus.TIMEOUT
+    assert elapsed < 2.5
+
+
+def test_timed_out_request_does_not_run(cluster, tmp_path):
+    """Test a request that timed out in the agent queue never runs"""
+    agent = cluster.start(max_concurrency=1)
+    remote = RemoteCommandManager([agent.address], TOKEN)
+    marker = tmp_path / "marker"
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            busy = executor.submit(remote.execute, "sleep 2")
+            time.sleep(0.2)
+            result = remote.execute(["touch", str(marker)], timeout=0.5)
+            busy.result()
+        time.sleep(0.5)
+    finally:
+        remote.close()
+    assert result.status == CommandStatus.TIMEOUT
+    assert not marker.exists()
+
+
+def test_cancelled_request_does_not_run(cluster, tmp_path):
+    """Test agents drop queued requests the client cancelled"""
+    agent = cluster.start(max_concurrency=1)
+    marker = tmp_path / "marker"
+
+    async def scenario():
+        reader, writer = await open_connection(agent.address)
+        challenge = await read_frame(reader)
+        writer.write(encode_frame({
+            "type": "auth",
+            "digest": sign_challenge(TOKEN, challenge["nonce"])}))
+        await read_frame(reader)
+        for message in ({"type": "execute", "id": 1,
+                         "command": ["sleep", "0.5"]},
+                        {"type": "execute", "id": 2,
+                         "command": ["touch", str(marker)]},
+                        {"type": "cancel", "id": 2}):
+            writer.write(encode_frame(message))
+        replies = {}
+        while len(replies) < 2:
+            reply = await read_frame(reader)
+            replies[reply["id"]] = reply["result"]["status"]
+        writer.close()
+        return replies
+
+    replies = asyncio.run(scenario())
+    assert replies == {1: "success", 2: "cancelled"}
+    assert not marker.exists()